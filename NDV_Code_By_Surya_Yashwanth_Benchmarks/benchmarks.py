@@ -0,0 +1,335 @@
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+# Benchmarks for the three console apps in this repo: the student record
+# store, the tax calculator and the Netflix cleaning pipeline. Synthetic data
+# is generated at the chosen scale, every case is timed, and the results
+# (wall time, throughput and peak memory) are written as JSON so runs can be
+# compared over time:
+#   python benchmarks.py --scale small --output results.json
+#   python benchmarks.py --suite tax,netflix --scale medium --skip-memory
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# App module name -> path of its script, relative to the repo root
+APPS = {
+    "students": "NDV_Code_By_Surya_Yashwanth_Student_Record_Management_Console_App/Student_Record_Management_Console_App.py",
+    "tax": "NDV_Code_by_Surya_Yashwanth_Console_Based_Tax_Calculator/TaxCalculator.py",
+    "netflix": "NDV_Code_By_Surya_Yashwanth_Data_Clean_and_Preprocess_Netflixtitles/Data_Clean_and_Preprocess_Netflixtitles.py",
+}
+
+# Number of records generated for each suite at every scale
+SCALES = {
+    "small": {"students": 10_000, "incomes": 1_000_000, "titles": 100_000},
+    "medium": {"students": 100_000, "incomes": 5_000_000, "titles": 1_000_000},
+    "large": {"students": 1_000_000, "incomes": 10_000_000, "titles": 10_000_000},
+}
+
+# The scalar tax functions are timed on at most this many incomes
+SCALAR_TAX_LIMIT = 1_000_000
+
+BRANCHES = ["CSE", "ECE", "EEE", "MECH", "CIVIL", "IT"]
+COUNTRIES = ["United States", "India", "United Kingdom", "South Korea", "Japan", "Spain", "France", "Canada"]
+GENRES = ["Dramas", "Comedies", "Documentaries", "International TV Shows", "TV Dramas",
+          "Action & Adventure", "Thrillers", "Kids' TV", "Romantic Movies", "Stand-Up Comedy"]
+RATINGS = ["TV-MA", "TV-14", "TV-PG", "R", "PG-13", "TV-Y7", "PG", "G"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+
+
+def load_app(name):
+    """
+    Imports one of the app scripts as a module. The scripts only run their
+    console interface under 'if __name__ == "__main__"', so importing them
+    has no side effects.
+    """
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_ROOT, APPS[name]))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Synthetic Data ---
+
+def generate_students(n, seed=0):
+    """
+    Returns 'n' student records as dicts with the keys used in the data files.
+    """
+    rng = random.Random(seed)
+    return [{
+        "Student_id": f"S{i:07d}",
+        "Name": f"Student {i}",
+        "Branch": rng.choice(BRANCHES),
+        "Year": rng.randint(1, 4),
+        "Marks": round(rng.uniform(0, 100), 1),
+    } for i in range(n)]
+
+
+def generate_incomes(n, seed=0):
+    """
+    Returns 'n' annual incomes between Rs. 1 lakh and 1 crore, log-uniformly
+    spread so every slab gets a share, as a NumPy array when NumPy is
+    available and a list otherwise.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        rng = random.Random(seed)
+        return [round(10 ** rng.uniform(5, 7)) for _ in range(n)]
+    return np.round(10 ** np.random.default_rng(seed).uniform(5, 7, n))
+
+
+def generate_employees_csv(path, n, seed=0, chunk_size=100_000):
+    """
+    Writes 'n' employees (id, ctc, bonus) to a CSV file for the payroll batch.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "ctc", "bonus"])
+        for start in range(0, n, chunk_size):
+            writer.writerows([f"E{i:08d}", round(10 ** rng.uniform(5, 7)), rng.choice([0, 0, 50_000, 100_000])]
+                             for i in range(start, min(start + chunk_size, n)))
+
+
+def generate_netflix_csv(path, n, seed=0, chunk_size=100_000):
+    """
+    Writes a Netflix-like catalog of 'n' titles to a CSV file, chunk by chunk.
+    Like the real data it has missing directors, casts, countries and
+    ratings, comma-joined multi-valued columns, dates with stray leading
+    spaces and about 1% duplicate rows.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["show_id", "type", "title", "director", "cast", "country", "date_added",
+                         "release_year", "rating", "duration", "listed_in", "description"])
+        previous = None
+        for start in range(0, n, chunk_size):
+            rows = []
+            for i in range(start, min(start + chunk_size, n)):
+                if previous is not None and rng.random() < 0.01:
+                    rows.append(previous)
+                    continue
+                is_movie = rng.random() < 0.7
+                date_added = f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2008, 2021)}"
+                previous = [
+                    f"s{i}",
+                    "Movie" if is_movie else "TV Show",
+                    f"Title {i}",
+                    "" if rng.random() < 0.3 else f"Director {rng.randint(1, n // 10 + 1)}",
+                    "" if rng.random() < 0.1 else ", ".join(f"Actor {rng.randint(1, n)}" for _ in range(rng.randint(1, 6))),
+                    "" if rng.random() < 0.1 else ", ".join(rng.sample(COUNTRIES, rng.randint(1, 3))),
+                    (" " if rng.random() < 0.05 else "") + date_added if rng.random() > 0.001 else "",
+                    rng.randint(1950, 2021),
+                    "" if rng.random() < 0.001 else rng.choice(RATINGS),
+                    f"{rng.randint(60, 180)} min" if is_movie else f"{rng.randint(1, 9)} Season{'s' * (rng.random() < 0.8)}",
+                    ", ".join(rng.sample(GENRES, rng.randint(1, 3))),
+                    "A synthetic description.",
+                ]
+                rows.append(previous)
+            writer.writerows(rows)
+
+
+# --- Measurement ---
+
+class BenchmarkRun:
+    """
+    Collects benchmark results. Each case is timed once without tracing;
+    unless memory tracking is off it then runs again under tracemalloc to
+    find its peak memory, because tracing slows allocation-heavy code too
+    much to share a run with the timing.
+    """
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.results = []
+
+    def measure(self, suite, name, items, run, setup=None):
+        """
+        Times run(setup()) (or run() without a setup) over 'items' records
+        and returns what the timed run returned. Output printed by the code
+        under test is discarded.
+        """
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            value = run(state) if setup else run()
+            elapsed = time.perf_counter() - start
+
+            peak = None
+            if self.track_memory:
+                state = setup() if setup else None
+                tracemalloc.start()
+                run(state) if setup else run()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+        result = {
+            "suite": suite,
+            "name": name,
+            "items": items,
+            "wall_time_s": round(elapsed, 6),
+            "throughput_per_s": round(items / elapsed, 1) if elapsed > 0 else None,
+            "peak_memory_mb": round(peak / 2 ** 20, 2) if peak is not None else None,
+        }
+        self.results.append(result)
+        peak_text = f"{result['peak_memory_mb']:.1f}" if peak is not None else "-"
+        print(f"{suite:<10}{name:<34}{items:>12,}{elapsed:>12.3f}{result['throughput_per_s'] or 0:>16,.0f}{peak_text:>12}")
+        return value
+
+
+# --- Suites ---
+
+def bench_students(bench, n, workdir, seed=0):
+    """
+    StudentManager and StudentStore: bulk add, single adds, lookups,
+    filtered queries, saving and loading, for both storage backends.
+    """
+    app = load_app("students")
+    records = generate_students(n, seed)
+    students = [app.Student.from_dict(record) for record in records]
+    lookups = [records[i]["Student_id"] for i in random.Random(seed).sample(range(n), min(n, 100_000))]
+
+    def store_add():
+        store = app.StudentStore()
+        for student in students:
+            store.add(student)
+        return store
+
+    bench.measure("students", "store.add", n, store_add)
+
+    for backend, extension in [("json", ".json"), ("sqlite", ".db")]:
+        def new_manager(backend=backend, extension=extension):
+            path = os.path.join(workdir, f"students_{backend}_{time.perf_counter_ns()}{extension}")
+            return app.StudentManager(path, backend=backend, compact_threshold=n + 1)
+
+        manager = bench.measure("students", f"{backend}.bulk_add", n,
+                                lambda manager: (manager.bulk_add(records), manager)[1], new_manager)
+        bench.measure("students", f"{backend}.find_by_id", len(lookups),
+                      lambda: [manager.students.get(student_id) for student_id in lookups])
+        bench.measure("students", f"{backend}.query_branch_year", n,
+                      lambda: manager.query(branch=BRANCHES[0], year=2))
+        bench.measure("students", f"{backend}.top_n", n, lambda: manager.top_n(10))
+        if backend == "json":
+            bench.measure("students", "json.save", n, lambda: manager.storage.save(manager.students))
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            manager.close()
+        bench.measure("students", f"{backend}.load", n,
+                      lambda: app.StudentManager(manager.file_name, backend=backend))
+        if backend == "json":
+            bench.measure("students", "json.load_columnar", n,
+                          lambda: app.StudentManager(manager.file_name, columnar=True))
+
+
+def bench_tax(bench, n, workdir, seed=0):
+    """
+    The tax functions one income at a time and in batches, the regime
+    comparison and the payroll batch mode.
+    """
+    app = load_app("tax")
+    incomes = generate_incomes(n, seed)
+    scalar_incomes = [float(income) for income in incomes[:SCALAR_TAX_LIMIT]]
+
+    bench.measure("tax", "old_regime.scalar", len(scalar_incomes),
+                  lambda: [app.calculate_old_regime_tax(income) for income in scalar_incomes])
+    bench.measure("tax", "new_regime.scalar", len(scalar_incomes),
+                  lambda: [app.calculate_new_regime_tax(income) for income in scalar_incomes])
+    bench.measure("tax", "old_regime.batch", n, lambda: app.calculate_old_regime_tax_batch(incomes))
+    bench.measure("tax", "new_regime.batch", n, lambda: app.calculate_new_regime_tax_batch(incomes))
+    bench.measure("tax", "compare_regimes.all", n, lambda: app.compare_regimes(incomes))
+
+    employees = min(n, SCALAR_TAX_LIMIT)
+    input_path = os.path.join(workdir, "employees.csv")
+    generate_employees_csv(input_path, employees, seed)
+    bench.measure("tax", "run_batch.csv", employees,
+                  lambda: app.run_batch(input_path, os.path.join(workdir, "payroll_tax.csv")))
+
+
+def bench_netflix(bench, n, workdir, seed=0):
+    """
+    Every step of the Netflix cleaning pipeline, each fed the previous
+    step's output, plus the chunked mode end to end.
+    """
+    app = load_app("netflix")
+    csv_path = os.path.join(workdir, "netflix_titles.csv")
+    generate_netflix_csv(csv_path, n, seed)
+
+    df = bench.measure("netflix", "load", n, lambda: app.load_dataset(csv_path))
+    df = bench.measure("netflix", "impute", len(df), lambda: app.impute_missing(df))
+    df = bench.measure("netflix", "dedup", len(df), lambda: app.remove_duplicates(df))
+    df = bench.measure("netflix", "type_convert", len(df), lambda: app.convert_types(df, {}))
+    df = bench.measure("netflix", "derive", len(df), lambda: app.derive_features(df, 2021))
+    normalized = bench.measure("netflix", "normalize", len(df), lambda: app.normalize_dtypes(df))
+    for name in app.BRIDGE_COLUMNS:
+        bench.measure("netflix", f"bridge_{name}", len(df), lambda name=name: app.build_bridge(normalized, name))
+    bench.measure("netflix", "encode", len(df),
+                  lambda: app.encode_categoricals(df, app.categorical_cols_for_encoding))
+    bench.measure("netflix", "profile", len(df), lambda: app.profile_dataset(normalized))
+    bench.measure("netflix", "export_csv", len(df),
+                  lambda: app.export_dataset(df, os.path.join(workdir, "netflix_cleaned.csv")))
+    if app.pa is not None:
+        bench.measure("netflix", "export_parquet", len(df),
+                      lambda: app.export_dataset(df, os.path.join(workdir, "netflix_cleaned.parquet")))
+    bench.measure("netflix", "chunked_end_to_end", n,
+                  lambda: app.run_chunked(csv_path, os.path.join(workdir, "netflix_chunked.csv")))
+
+
+SUITES = {"students": bench_students, "tax": bench_tax, "netflix": bench_netflix}
+
+# Record count used by each suite, as named in SCALES
+SUITE_SIZES = {"students": "students", "tax": "incomes", "netflix": "titles"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the student, tax and Netflix apps.")
+    parser.add_argument("--scale", choices=SCALES, default="small",
+                        help="Data size: " + "; ".join(f"{name} = {sizes}" for name, sizes in SCALES.items()))
+    parser.add_argument("--suite", default=",".join(SUITES),
+                        help=f"Comma-separated suites to run (default: {','.join(SUITES)})")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--skip-memory", action="store_true",
+                        help="Don't re-run every case under tracemalloc to measure peak memory")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    suites = [name.strip() for name in args.suite.split(",") if name.strip()]
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        raise SystemExit(f"Unknown suite(s): {', '.join(unknown)}. Choose from {', '.join(SUITES)}.")
+
+    bench = BenchmarkRun(track_memory=not args.skip_memory)
+    print(f"{'Suite':<10}{'Case':<34}{'Items':>12}{'Wall (s)':>12}{'Items/s':>16}{'Peak (MB)':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in suites:
+            SUITES[name](bench, SCALES[args.scale][SUITE_SIZES[name]], workdir, args.seed)
+
+    report = {
+        "scale": args.scale,
+        "sizes": SCALES[args.scale],
+        "seed": args.seed,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": bench.results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
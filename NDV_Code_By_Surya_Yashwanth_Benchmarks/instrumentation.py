@@ -0,0 +1,311 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+# Opt-in instrumentation shared by the student, tax and Netflix apps.
+# Each app registers the flags with add_arguments() and passes its list of
+# hot paths to install_from_args(). Nothing is wrapped while
+# instrumentation is off, so the apps run their own code untouched. When
+# the --instrument/--trace flags or the NDV_INSTRUMENT environment
+# variable turn it on, the hot-path functions are replaced with wrappers
+# that record:
+#   - call counts and a latency histogram per function or section,
+#   - bytes read and written, from per-function byte counters,
+#   - allocation peaks per call (tracemalloc, only with memory tracking),
+# and at exit prints a summary to stderr and optionally writes a Chrome
+# trace (load it in chrome://tracing or https://ui.perfetto.dev).
+#
+#   NDV_INSTRUMENT=1                 summary only
+#   NDV_INSTRUMENT=trace.json        summary and Chrome trace
+#   NDV_INSTRUMENT_MEMORY=1          also track allocation peaks (slower)
+
+ENV_VAR = "NDV_INSTRUMENT"
+MEMORY_ENV_VAR = "NDV_INSTRUMENT_MEMORY"
+
+# Trace events kept for the Chrome trace; later calls are still counted
+MAX_TRACE_EVENTS = 200_000
+
+# Latency histogram buckets: bucket k counts calls that took less than 2**k
+# microseconds (and at least 2**(k-1))
+HISTOGRAM_BUCKETS = 40
+
+
+class Stat:
+    """
+    Counters for one instrumented function or section.
+    """
+    __slots__ = ("calls", "errors", "total", "max", "histogram", "bytes_read", "bytes_written", "peak")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.peak = None
+
+    def add_time(self, elapsed):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.histogram[min(int(elapsed * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        """
+        Returns an upper bound of the q-th percentile latency in seconds,
+        from the histogram.
+        """
+        target = q / 100 * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(2 ** bucket / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_s": round(self.total, 6),
+            "mean_ms": round(self.total / self.calls * 1000, 4) if self.calls else None,
+            "p50_ms": round(self.percentile(50) * 1000, 4) if self.calls else None,
+            "p99_ms": round(self.percentile(99) * 1000, 4) if self.calls else None,
+            "max_ms": round(self.max * 1000, 4),
+            "latency_histogram_us": {f"<{2 ** bucket}": count for bucket, count in enumerate(self.histogram) if count},
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_memory_bytes": self.peak,
+        }
+
+
+class Recorder:
+    """
+    Collects the measurements of one process.
+    Allocation peaks of nested calls are tracked with a stack: tracemalloc
+    has a single peak counter, so a call resets it on entry and passes its
+    own peak up to its caller on exit.
+    """
+    def __init__(self, trace_path=None, track_memory=False):
+        self.trace_path = trace_path
+        self.track_memory = track_memory
+        self.stats = {}
+        self.events = []
+        self.dropped_events = 0
+        self.start = time.perf_counter()
+        self.pid = os.getpid()
+        self._memory_stack = []
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stat(self, name):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = Stat()
+        return stat
+
+    def _enter_memory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._memory_stack:
+            frame = self._memory_stack[-1]
+            frame[1] = max(frame[1], peak)
+        tracemalloc.reset_peak()
+        self._memory_stack.append([current, 0])
+
+    def _exit_memory(self):
+        current_at_start, child_peak = self._memory_stack.pop()
+        peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+        if self._memory_stack:
+            frame = self._memory_stack[-1]
+            frame[1] = max(frame[1], peak)
+        return peak - current_at_start
+
+    def record(self, name, category, start, elapsed, failed=False, peak=None):
+        stat = self.stat(name)
+        stat.add_time(elapsed)
+        if failed:
+            stat.errors += 1
+        if peak is not None and (stat.peak is None or peak > stat.peak):
+            stat.peak = peak
+        if self.trace_path:
+            if len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append({
+                    "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": threading.get_ident(),
+                    "ts": round((start - self.start) * 1e6, 3), "dur": round(elapsed * 1e6, 3),
+                })
+            else:
+                self.dropped_events += 1
+
+    def wrap(self, func, name, category="app", count_bytes=None):
+        """
+        Returns a wrapper around 'func' that records every call under 'name'.
+        'count_bytes', if given, is called after each successful call with
+        the result and a dict of the call's arguments by parameter name, and
+        returns the (read, written) bytes of that call.
+        """
+        signature = inspect.signature(func) if count_bytes is not None else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self.track_memory:
+                self._enter_memory()
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                peak = self._exit_memory() if self.track_memory else None
+                self.record(name, category, start, elapsed, failed, peak)
+                if count_bytes is not None and not failed:
+                    arguments = signature.bind(*args, **kwargs)
+                    arguments.apply_defaults()
+                    read, written = count_bytes(result, arguments.arguments)
+                    self.add_bytes(name, read, written)
+        wrapper.__instrumented__ = True
+        return wrapper
+
+    def instrument(self, owner, names, category="app", prefix=None):
+        """
+        Replaces the named functions of a module or methods of a class with
+        recording wrappers. Each entry of 'names' is a name or a
+        (name, count_bytes) pair (see wrap). Calls are recorded as
+        '<prefix>.<name>', the prefix defaulting to the class or module
+        name. Already instrumented functions are left alone.
+        """
+        prefix = prefix or getattr(owner, "__name__", type(owner).__name__)
+        for entry in names:
+            name, count_bytes = entry if isinstance(entry, tuple) else (entry, None)
+            func = getattr(owner, name)
+            if getattr(func, "__instrumented__", False):
+                continue
+            setattr(owner, name, self.wrap(func, f"{prefix}.{name}", category, count_bytes))
+
+    def add_bytes(self, name, read=0, written=0):
+        """
+        Adds bytes read from or written to files under 'name'.
+        """
+        stat = self.stat(name)
+        stat.bytes_read += read
+        stat.bytes_written += written
+
+    def summary(self):
+        """
+        Returns a plain-text table of the recorded stats, slowest first.
+        """
+        lines = [f"{'Instrumented call':<44}{'Calls':>10}{'Total (s)':>12}{'Mean (ms)':>12}"
+                 f"{'p99 (ms)':>12}{'Read (MB)':>11}{'Written (MB)':>14}{'Peak (MB)':>11}"]
+        for name, stat in sorted(self.stats.items(), key=lambda item: -item[1].total):
+            mean = stat.total / stat.calls * 1000 if stat.calls else 0.0
+            peak = f"{stat.peak / 2 ** 20:.1f}" if stat.peak is not None else "-"
+            lines.append(f"{name:<44}{stat.calls:>10,}{stat.total:>12.3f}{mean:>12.3f}"
+                         f"{stat.percentile(99) * 1000:>12.3f}{stat.bytes_read / 2 ** 20:>11.2f}"
+                         f"{stat.bytes_written / 2 ** 20:>14.2f}{peak:>11}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        """
+        Writes the recorded calls as a Chrome trace-event JSON file, with
+        the per-call stats in its metadata.
+        """
+        with open(path, "w") as f:
+            json.dump({
+                "traceEvents": self.events,
+                "displayTimeUnit": "ms",
+                "otherData": {
+                    "dropped_events": self.dropped_events,
+                    "stats": {name: stat.to_dict() for name, stat in self.stats.items()},
+                },
+            }, f)
+
+    def finish(self):
+        """
+        Prints the summary to stderr and writes the trace file, if any.
+        Registered to run at exit.
+        """
+        if not self.stats:
+            return
+        print("\n--- Instrumentation Summary ---", file=sys.stderr)
+        print(self.summary(), file=sys.stderr)
+        if self.trace_path:
+            self.write_trace(self.trace_path)
+            print(f"Chrome trace written to '{self.trace_path}'", file=sys.stderr)
+
+
+# The process-wide Recorder, created by enable()
+_recorder = None
+
+
+def settings_from_env(environ=None):
+    """
+    Reads NDV_INSTRUMENT / NDV_INSTRUMENT_MEMORY. Returns None when
+    instrumentation is off, otherwise (trace path or None, track memory).
+    """
+    environ = os.environ if environ is None else environ
+    value = environ.get(ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    trace_path = None if value.lower() in ("1", "true", "yes", "on", "summary") else value
+    return trace_path, environ.get(MEMORY_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable(trace_path=None, track_memory=False):
+    """
+    Creates the process-wide Recorder (once) and registers its summary to
+    be printed at exit. Returns the Recorder.
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder(trace_path, track_memory)
+        atexit.register(_recorder.finish)
+    return _recorder
+
+
+def add_arguments(parser, what="the hot paths"):
+    """
+    Adds the --instrument, --trace and --instrument-memory flags to an
+    app's argparse parser; 'what' names what gets measured, for the help.
+    """
+    parser.add_argument("--instrument", action="store_true",
+                        help=f"Record call counts, latencies and bytes of {what} and print a summary "
+                             f"at exit (or set {ENV_VAR})")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Instrument as with --instrument and also write a Chrome trace to FILE")
+    parser.add_argument("--instrument-memory", action="store_true",
+                        help="With instrumentation on, also record allocation peaks (slower)")
+
+
+def install_from_args(args, module_name, prefix, hot_paths):
+    """
+    Turns instrumentation on when the flags from add_arguments() or, failing
+    them, NDV_INSTRUMENT ask for it, and wraps the app's hot paths.
+    'hot_paths' is a list of (owner, category, names): the owner is a
+    class, or None for functions of the module 'module_name' (the app's
+    __name__), which are recorded as '<prefix>.<name>'; 'names' is as for
+    Recorder.instrument. Returns the Recorder, or None (and wraps nothing)
+    if instrumentation stays off.
+    """
+    if args.instrument or args.trace:
+        recorder = enable(args.trace, args.instrument_memory)
+    else:
+        settings = settings_from_env()
+        if settings is None:
+            return None
+        recorder = enable(settings[0], args.instrument_memory or settings[1])
+    for owner, category, names in hot_paths:
+        if owner is None:
+            recorder.instrument(sys.modules[module_name], names, category, prefix=prefix)
+        else:
+            recorder.instrument(owner, names, category)
+    return recorder
@@ -0,0 +1,102 @@
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data_Clean_and_Preprocess_Netflixtitles.py")
+spec = importlib.util.spec_from_file_location("netflix_pipeline", SCRIPT)
+netflix = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(netflix)
+
+
+def build_stages(cache_dir):
+    runner = netflix.PipelineRunner(str(cache_dir))
+    return netflix.build_pipeline(runner, None)
+
+
+def test_bridge_tables_are_integer_coded(tmp_path):
+    stages = build_stages(tmp_path)
+    for name in netflix.BRIDGE_COLUMNS:
+        bridge = stages[f'bridge-{name}'].value
+        assert bridge['title_id'].dtype == 'int32'
+        assert isinstance(bridge[name].dtype, pd.CategoricalDtype)
+        assert bridge[name].cat.codes.dtype.kind == 'i'
+
+
+def test_bridge_tables_stay_categorical_through_the_cache(tmp_path):
+    build_stages(tmp_path)['bridge-country'].value
+    bridge = build_stages(tmp_path)['bridge-country'].value
+    assert isinstance(bridge['country'].dtype, pd.CategoricalDtype)
+
+
+def test_profile_correlation_is_nan_for_constant_pairs():
+    rng = np.random.default_rng(0)
+    is_show = rng.random(30000) < 0.3
+    df = pd.DataFrame({
+        'type_encoded': is_show.astype(np.int32),
+        'duration_seasons': np.where(is_show, rng.integers(1, 9, len(is_show)), np.nan),
+        'release_year': rng.integers(1950, 2024, len(is_show)),
+    })
+    profile = netflix.ProfileAccumulator()
+    for start in range(0, len(df), 7000):
+        profile.update(df.iloc[start:start + 7000])
+    pd.testing.assert_frame_equal(profile.correlation(), df.corr(), atol=1e-9)
+    json.dumps(profile.result(), allow_nan=False)
+
+
+def test_unseen_rows_drops_rows_seen_in_this_or_earlier_chunks():
+    seen = set()
+    first = netflix.unseen_rows(pd.Series([1, 2, 2, 3], dtype=np.uint64), seen)
+    second = netflix.unseen_rows(pd.Series([3, 4, 1, 4], dtype=np.uint64), seen)
+    assert first.tolist() == [True, True, False, True]
+    assert second.tolist() == [False, True, False, False]
+    assert seen == {1, 2, 3, 4}
+
+
+def load_script(path):
+    script_spec = importlib.util.spec_from_file_location("netflix_pipeline_copy", path)
+    module = importlib.util.module_from_spec(script_spec)
+    script_spec.loader.exec_module(module)
+    return module
+
+
+def test_stage_key_depends_on_helper_source(tmp_path):
+    with open(SCRIPT) as f:
+        source = f.read()
+    copy = tmp_path / "copy.py"
+    copy.write_text(source)
+    key = load_script(copy).build_pipeline(netflix.PipelineRunner(use_cache=False), None)['type-convert'].key
+    assert build_stages(tmp_path)['type-convert'].key == key
+    # An edit to a helper the stage calls, not to the stage function itself
+    copy.write_text(source.replace("def parse_duration(df):", "def parse_duration(df):\n    pass", 1))
+    edited = load_script(copy).build_pipeline(netflix.PipelineRunner(use_cache=False), None)['type-convert'].key
+    assert edited != key
+
+
+def test_parsing_columns_without_any_values():
+    # pandas reads a chunk with no dates or durations as float NaN
+    for dates in (pd.Series([np.nan, np.nan]), pd.Series([], dtype=float)):
+        parsed, counts = netflix.parse_date_added(dates)
+        assert parsed.isna().all() and len(parsed) == len(dates)
+        assert parsed.dtype.kind == 'M'
+        assert counts == {'fallback': 0, 'nat': 0}
+    frame = pd.DataFrame({'type': ['Movie', 'TV Show'], 'duration': [np.nan, np.nan]})
+    minutes, seasons = netflix.parse_duration(frame)
+    assert minutes.isna().all() and seasons.isna().all()
+
+
+def test_parse_date_added_counts_fallback_and_unparsable_rows():
+    dates = pd.Series([' September 25, 2021', '2019-05-01', 'not a date', np.nan, 'September 25, 2021'])
+    parsed, counts = netflix.parse_date_added(dates)
+    assert parsed.tolist()[:2] == [pd.Timestamp('2021-09-25'), pd.Timestamp('2019-05-01')]
+    assert parsed.isna().tolist() == [False, False, True, True, False]
+    assert counts == {'fallback': 2, 'nat': 1}
+
+
+def test_parse_args_rejects_unknown_flags():
+    assert netflix.parse_args(['--chunksize', '5000']).chunksize == 5000
+    with pytest.raises(SystemExit):
+        netflix.parse_args(['--chunked', 'nf.csv', '--chunk-size', '5000', '--ouput', 'typo.csv'])
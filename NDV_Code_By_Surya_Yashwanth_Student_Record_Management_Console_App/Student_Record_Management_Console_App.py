@@ -1,10 +1,56 @@
+import argparse
+import csv
+import heapq
 import json
 import os
+import sqlite3
+import sys
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain, islice
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# The shared opt-in instrumentation lives with the benchmarks; without it
+# (e.g. the app copied on its own) the --instrument flags are not offered
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "NDV_Code_By_Surya_Yashwanth_Benchmarks"))
+try:
+    import instrumentation
+except ImportError:
+    instrumentation = None
+
+# Maps the keys used in the JSON/CSV files to the Student attribute names
+FIELD_NAMES = {
+    "Student_id": "student_id",
+    "Name": "name",
+    "Branch": "branch",
+    "Year": "year",
+    "Marks": "marks"
+}
+
+
+# Column headers of the student table shown by view_students
+TABLE_COLUMNS = ["ID", "Name", "Branch", "Year", "Marks"]
+
+# Rows are written to stdout in chunks of this many lines
+RENDER_CHUNK_ROWS = 1000
+
+
 
 class Student:
     """
     Represents a single student record with ID, name, branch, year, and marks.
+    Uses __slots__ so each record carries no per-instance __dict__.
     """
+    __slots__ = ("student_id", "name", "branch", "year", "marks")
+
     def __init__(self, Student_id, Name, Branch, Year, Marks):
         self.student_id = Student_id
         self.name = Name
@@ -24,6 +70,12 @@ class Student:
             "Marks": self.marks
         }
 
+    def to_row(self):
+        """
+        Returns the record as a tuple in FIELD_NAMES order (used for CSV).
+        """
+        return (self.student_id, self.name, self.branch, self.year, self.marks)
+
     @classmethod
     def from_dict(cls, data):
         """
@@ -46,57 +98,916 @@ class Student:
                 f"Year: {self.year}, Marks: {self.marks}")
 
 
-class StudentManager:
+class StudentRow:
     """
-    Manages the collection of student records, including loading, saving,
-    adding, viewing, updating, and deleting.
+    A live view of one row of a StudentTable.
+    Offers the same attributes and methods as Student; reads and writes go
+    straight to the table's columns.
     """
-    def __init__(self, file_name="students.json"):
-        self.file_name = file_name
-        self.students = []
-        self._load_data()
+    __slots__ = ("_table", "student_id")
 
-    def _load_data(self):
+    def __init__(self, table, student_id):
+        self._table = table
+        self.student_id = student_id
+
+    def _get(self, column):
+        return getattr(self._table, column)[self._table._positions[self.student_id]]
+
+    def _set(self, column, value):
+        getattr(self._table, column)[self._table._positions[self.student_id]] = value
+
+    name = property(lambda self: self._get("names"),
+                    lambda self, value: self._set("names", sys.intern(value)))
+    branch = property(lambda self: self._get("branches"),
+                      lambda self, value: self._set("branches", sys.intern(value)))
+    year = property(lambda self: self._get("years"),
+                    lambda self, value: self._set("years", value))
+    marks = property(lambda self: self._get("marks"),
+                     lambda self, value: self._set("marks", value))
+
+    to_dict = Student.to_dict
+    to_row = Student.to_row
+    __str__ = Student.__str__
+
+
+class StudentTable:
+    """
+    Columnar storage for student records.
+    IDs, names and branches are kept in lists of interned strings and
+    year/marks in typed arrays, which takes far less memory than one object
+    per record and lets aggregates over marks run over a flat array.
+    Behaves like a dict of student_id -> StudentRow so it can back a
+    StudentStore.
+    """
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.branches = []
+        self.years = array('i')
+        self.marks = array('d')
+        self._positions = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, student_id):
+        return student_id in self._positions
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __setitem__(self, student_id, student):
         """
-        Loads student data from the JSON file into the 'students' list.
-        If the file doesn't exist, it initializes an empty list.
+        Stores a Student's values in the columns, overwriting any existing row.
         """
-        if os.path.exists(self.file_name):
-            try:
-                with open(self.file_name, 'r') as f:
-                    data = json.load(f)
-                    self.students = [Student.from_dict(d) for d in data]
-                print(f"Data loaded successfully from '{self.file_name}'.")
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON from '{self.file_name}'. Starting with empty records.")
-                self.students = []
-            except Exception as e:
-                print(f"An unexpected error occurred while loading data: {e}. Starting with empty records.")
-                self.students = []
+        values = (sys.intern(student.name), sys.intern(student.branch), student.year, student.marks)
+        position = self._positions.get(student_id)
+        if position is None:
+            student_id = sys.intern(student_id)
+            self._positions[student_id] = len(self.ids)
+            self.ids.append(student_id)
+            self.names.append(values[0])
+            self.branches.append(values[1])
+            self.years.append(values[2])
+            self.marks.append(values[3])
         else:
-            print(f"No existing data file '{self.file_name}' found. Starting with empty records.")
+            self.names[position], self.branches[position], self.years[position], self.marks[position] = values
+
+    def get(self, student_id, default=None):
+        if student_id not in self._positions:
+            return default
+        return StudentRow(self, student_id)
+
+    def values(self):
+        return (StudentRow(self, student_id) for student_id in self.ids)
+
+    def pop(self, student_id, default=None):
+        """
+        Removes a row and returns it as a detached Student.
+        The last row is moved into the freed slot, so removal is O(1).
+        """
+        position = self._positions.pop(student_id, None)
+        if position is None:
+            return default
+        removed = Student(student_id, self.names[position], self.branches[position],
+                          self.years[position], self.marks[position])
+        last = len(self.ids) - 1
+        for column in (self.ids, self.names, self.branches, self.years, self.marks):
+            if position != last:
+                column[position] = column[last]
+            column.pop()
+        if position != last:
+            self._positions[self.ids[position]] = position
+        return removed
+
+    def clear(self):
+        self.__init__()
+
+    def column(self, field):
+        """
+        Returns the column holding the given Student attribute.
+        """
+        return {"student_id": self.ids, "name": self.names, "branch": self.branches,
+                "year": self.years, "marks": self.marks}[field]
+
+
+class MarksStats:
+    """
+    Running statistics over a group of marks.
+    Keeps a count, a sum and a Counter of distinct mark values, so adding or
+    removing a record is O(1) and percentiles only sort the distinct values
+    (at most a few thousand for marks between 0 and 100).
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self._values = Counter()
+        self._sorted = None
+
+    def add(self, marks):
+        self.count += 1
+        self.total += marks
+        self._values[marks] += 1
+        self._sorted = None
+
+    def remove(self, marks):
+        self.count -= 1
+        self.total -= marks
+        self._values[marks] -= 1
+        if not self._values[marks]:
+            del self._values[marks]
+        self._sorted = None
+
+    def _value_at(self, rank):
+        """
+        Returns the mark at a 0-based position in sorted order.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._values.items())
+        seen = 0
+        for value, count in self._sorted:
+            seen += count
+            if rank < seen:
+                return value
+        return self._sorted[-1][0]
+
+    def percentile(self, q):
+        """
+        Returns the q-th percentile (0-100), interpolating linearly between
+        the two closest ranks. Returns None for an empty group.
+        """
+        if not self.count:
+            return None
+        position = (self.count - 1) * q / 100
+        lower = int(position)
+        low_value = self._value_at(lower)
+        if lower == position:
+            return low_value
+        return low_value + (self._value_at(lower + 1) - low_value) * (position - lower)
+
+    def summary(self, percentiles=(25, 50, 75)):
+        """
+        Returns count, mean, min, max and the requested percentiles as a dict.
+        """
+        result = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.percentile(0),
+            "max": self.percentile(100)
+        }
+        for q in percentiles:
+            result[f"p{q:g}"] = self.percentile(q)
+        return result
+
+
+class StudentStore:
+    """
+    In-memory store of Student records.
+    Keeps a primary index keyed by student ID plus optional secondary
+    indexes (branch and year by default), so lookups, deletes and
+    branch/year filters do not need to scan every record.
+    The primary index is a dict of Student objects unless another mapping,
+    such as a StudentTable, is passed as 'records'.
+    Marks statistics are kept up to date for the whole store and for every
+    value of each indexed field, so aggregate queries need no scan.
+    """
+    def __init__(self, students=None, indexes=("branch", "year"), records=None):
+        self._records = {} if records is None else records
+        self._indexes = {field: {} for field in indexes}
+        self._stats = {field: {} for field in indexes}
+        self._overall_stats = MarksStats()
+        # Widest display width per table column, measured on the first view
+        # and widened by later additions; a removal drops it (see column_widths)
+        self._widths = None
+        if students is not None:
+            for student in students:
+                self.put(student)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __contains__(self, student_id):
+        return student_id in self._records
+
+    def get(self, student_id):
+        """
+        Returns the Student with the given ID, or None if it is not stored.
+        """
+        return self._records.get(student_id)
+
+    def add(self, student):
+        """
+        Adds a new Student. Raises ValueError if the ID is already taken.
+        """
+        if student.student_id in self._records:
+            raise ValueError(f"Student with ID '{student.student_id}' already exists.")
+        self._records[student.student_id] = student
+        self._index(student)
+
+    def put(self, student):
+        """
+        Adds a Student, replacing any existing record with the same ID.
+        """
+        self.remove(student.student_id)
+        self._records[student.student_id] = student
+        self._index(student)
+
+    def clear(self):
+        """
+        Removes every record and empties the indexes.
+        """
+        self._records.clear()
+        for index in self._indexes.values():
+            index.clear()
+        for groups in self._stats.values():
+            groups.clear()
+        self._overall_stats = MarksStats()
+        self._widths = None
+
+    def remove(self, student_id):
+        """
+        Removes and returns the Student with the given ID, or None if absent.
+        """
+        student = self._records.pop(student_id, None)
+        if student is not None:
+            self._unindex(student)
+        return student
+
+    def update(self, student_id, **changes):
+        """
+        Updates fields of a stored Student and keeps the secondary indexes
+        in sync. Returns the updated Student, or None if the ID is unknown.
+        """
+        student = self._records.get(student_id)
+        if student is None:
+            return None
+        self._unindex(student)
+        for field, value in changes.items():
+            setattr(student, field, value)
+        self._index(student)
+        return student
+
+    def find_by(self, field, value):
+        """
+        Returns the list of Students whose 'field' equals 'value'.
+        Uses the secondary index when one exists for the field.
+        """
+        index = self._indexes.get(field)
+        if index is None:
+            return [s for s in self._records.values() if getattr(s, field) == value]
+        return [self._records.get(student_id) for student_id in index.get(value, ())]
+
+    def column(self, field):
+        """
+        Returns all values of one Student attribute, in storage order.
+        With a StudentTable backend this is the column itself, no copy made.
+        """
+        if isinstance(self._records, StudentTable):
+            return self._records.column(field)
+        return [getattr(s, field) for s in self._records.values()]
+
+    def marks_between(self, low, high):
+        """
+        Returns the Students whose marks lie between 'low' and 'high'.
+        With a StudentTable backend only the marks column is scanned and
+        rows are built for the matching students alone.
+        """
+        if isinstance(self._records, StudentTable):
+            ids, marks = self.column("student_id"), self.column("marks")
+            return [self._records.get(student_id) for student_id, value in zip(ids, marks) if low <= value <= high]
+        return [s for s in self._records.values() if low <= s.marks <= high]
+
+    def filter(self, branch=None, year=None):
+        """
+        Returns the Students matching the given branch and/or year.
+        With no criteria, every stored Student is returned.
+        """
+        criteria = [(f, v) for f, v in (("branch", branch), ("year", year)) if v is not None]
+        if not criteria:
+            return list(self._records.values())
+        # Start from the smallest candidate set and check the rest of the criteria on it
+        candidates = min((self.find_by(f, v) for f, v in criteria), key=len)
+        return [s for s in candidates if all(getattr(s, f) == v for f, v in criteria)]
+
+    def stats(self, group_by=None):
+        """
+        Returns the MarksStats of the whole store, or a dict of MarksStats
+        per value of 'group_by' (an indexed field such as "branch").
+        """
+        if group_by is None:
+            return self._overall_stats
+        if group_by not in self._stats:
+            raise ValueError(f"Statistics are only kept for indexed fields: {', '.join(self._stats)}.")
+        return self._stats[group_by]
+
+    def column_widths(self):
+        """
+        Returns the width of the widest value in each table column.
+        The widths are measured with one scan the first time and then kept
+        until a record is removed or changed, so loading pays nothing.
+        """
+        if self._widths is None:
+            self._widths = _merge_widths(None, self._records.values())
+        return self._widths
+
+    def _index(self, student):
+        # Buckets map student IDs to None; they are used as ordered sets
+        marks = student.marks
+        self._overall_stats.add(marks)
+        if self._widths is not None:
+            # Read the record back, as stored, so the width matches what a
+            # view prints (a StudentTable returns marks as floats)
+            self._widths = _merge_widths(self._widths, [self._records.get(student.student_id)])
+        for field, index in self._indexes.items():
+            key = getattr(student, field)
+            index.setdefault(key, {})[student.student_id] = None
+            groups = self._stats[field]
+            if key not in groups:
+                groups[key] = MarksStats()
+            groups[key].add(marks)
+
+    def _unindex(self, student):
+        marks = student.marks
+        self._overall_stats.remove(marks)
+        # The removed value may have been the widest one
+        self._widths = None
+        for field, index in self._indexes.items():
+            key = getattr(student, field)
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(student.student_id, None)
+                if not bucket:
+                    del index[key]
+            groups = self._stats[field]
+            groups[key].remove(marks)
+            if not groups[key].count:
+                del groups[key]
+
+
+class JsonFileStorage:
+    """
+    Stores student records in a JSON (or JSONL) snapshot file.
+    In journal mode every change is appended to '<file_name>.journal' and
+    folded into the snapshot once the journal holds 'compact_threshold'
+    changes or as many as the last snapshot had records, whichever is more.
+    Scaling with the snapshot keeps bulk imports linear: each rewrite is
+    paid for by at least as many journaled changes.
+
+    Several processes can share the files: writes happen while holding a
+    lock on '<file_name>.lock', which also stores a generation counter that
+    is bumped on every write. A writer that finds the counter moved on
+    since its last look first merges the other processes' journal entries,
+    or reloads everything if the snapshot itself was replaced.
+    """
+    def __init__(self, file_name="students.json", journal=True, compact_threshold=1000):
+        self.file_name = file_name
+        self.journal = journal
+        self.journal_file = file_name + ".journal"
+        self.lock_file = file_name + ".lock"
+        self.compact_threshold = compact_threshold
+        self._journal_entries = 0
+        self._journal_offset = 0
+        self._snapshot_records = 0
+        self._generation = 0
+        self._snapshot_id = None
+        self._lock_handle = None
+
+    @contextmanager
+    def _locked(self, shared=False):
+        """
+        Holds the lock file for the duration of the block. Re-entrant within
+        one process, so a locked block may call other locked methods.
+        """
+        if self._lock_handle is not None:
+            yield self._lock_handle
+            return
+        handle = open(self.lock_file, 'a+')
+        try:
+            _lock_file(handle, shared)
+            self._lock_handle = handle
+            yield handle
+        finally:
+            self._lock_handle = None
+            _unlock_file(handle)
+            handle.close()
+
+    def _read_generation(self):
+        self._lock_handle.seek(0)
+        text = self._lock_handle.read().strip()
+        return int(text) if text.isdigit() else 0
+
+    def _write_generation(self, generation):
+        self._lock_handle.seek(0)
+        self._lock_handle.truncate()
+        self._lock_handle.write(str(generation))
+        self._lock_handle.flush()
+        self._generation = generation
+
+    def _current_snapshot_id(self):
+        """
+        Identifies the snapshot file on disk; it changes whenever the file is
+        replaced by a compaction.
+        """
+        try:
+            stat = os.stat(self.file_name)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def load(self, store):
+        """
+        Loads the snapshot file and then the journal into 'store'.
+        If the file doesn't exist, the store is left empty.
+        Records are parsed one at a time, so the raw file contents are never
+        held in memory next to the Student objects.
+        """
+        with self._locked(shared=True):
+            self._generation = self._read_generation()
+            self._snapshot_id = self._current_snapshot_id()
+            if os.path.exists(self.file_name):
+                try:
+                    for student in read_students(self.file_name):
+                        store.put(student)
+                    print(f"Data loaded successfully from '{self.file_name}'.")
+                except json.JSONDecodeError:
+                    print(f"Error decoding JSON from '{self.file_name}'. Starting with empty records.")
+                    store.clear()
+                except Exception as e:
+                    print(f"An unexpected error occurred while loading data: {e}. Starting with empty records.")
+                    store.clear()
+            else:
+                print(f"No existing data file '{self.file_name}' found. Starting with empty records.")
+            self._snapshot_records = len(store)
+            self._journal_entries = 0
+            self._journal_offset = 0
+            self._replay_journal(store)
+
+    def _replay_journal(self, store):
+        """
+        Applies the journal entries after the current offset to 'store'.
+        A torn last line (left behind by a crash in the middle of an append)
+        is cut off so that new entries are not appended to it.
+        """
+        if not os.path.exists(self.journal_file):
+            return
+        replayed = 0
+        try:
+            with open(self.journal_file, 'rb+') as f:
+                f.seek(self._journal_offset)
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        print(f"Discarding incomplete entry at the end of '{self.journal_file}'.")
+                        f.truncate(self._journal_offset)
+                        break
+                    _apply_entry(store, entry)
+                    replayed += 1
+                    self._journal_offset += len(line)
+        except Exception as e:
+            print(f"An unexpected error occurred while replaying '{self.journal_file}': {e}")
+        self._journal_entries += replayed
+        if replayed:
+            print(f"Replayed {replayed} change(s) from '{self.journal_file}'.")
 
-    def _save_data(self):
+    @contextmanager
+    def transaction(self, store):
+        """
+        Locks the files for writing and brings 'store' up to date with
+        changes other processes made since it was loaded: new journal
+        entries are merged in, and a replaced snapshot triggers a reload.
+        Changes must be validated, applied and recorded inside the block.
         """
-        Saves the current 'students' list to the JSON file.
-        Each Student object is converted to a dictionary before saving.
+        with self._locked():
+            if self._read_generation() != self._generation:
+                if self._current_snapshot_id() != self._snapshot_id:
+                    print(f"'{self.file_name}' was rewritten by another process. Reloading records.")
+                    store.clear()
+                    self.load(store)
+                else:
+                    self._replay_journal(store)
+                self._generation = self._read_generation()
+            yield
+
+    def stream(self):
+        """
+        Returns an iterator over the stored Students read straight from the
+        snapshot, or None if the journal holds changes the snapshot lacks.
+        """
+        if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > 0:
+            return None
+        if not os.path.exists(self.file_name):
+            return iter(())
+        return read_students(self.file_name)
+
+    def save(self, store):
         """
+        Saves every record in 'store' to the snapshot file.
+        The data is written to a temporary file first and then renamed over
+        the old one, so a crash never leaves a half-written file behind.
+        """
+        temp_file = f"{self.file_name}.{os.getpid()}.tmp"
         try:
-            with open(self.file_name, 'w') as f:
-                json.dump([s.to_dict() for s in self.students], f, indent=4)
+            with self._locked():
+                write_records(temp_file, store, format_path=self.file_name, sync=True)
+                os.replace(temp_file, self.file_name)
+                self._snapshot_id = self._current_snapshot_id()
+                self._snapshot_records = len(store)
+                self._write_generation(self._read_generation() + 1)
             print(f"Data saved successfully to '{self.file_name}'.")
+            return True
         except Exception as e:
             print(f"Error saving data to '{self.file_name}': {e}")
+            return False
+
+    def record(self, entries, store):
+        """
+        Persists a list of change entries that have already been applied to
+        'store'. In journal mode the entries are appended to the journal file
+        in one write; otherwise the whole snapshot is rewritten.
+        Call inside transaction() so no other process writes in between.
+        """
+        threshold = max(self.compact_threshold, self._snapshot_records)
+        if not self.journal or self._journal_entries + len(entries) >= threshold:
+            # The store already holds these changes, so writing a snapshot is
+            # cheaper than journaling a batch that would trigger a compaction
+            # right away
+            self.compact(store)
+            return
+        data = self._encode_entries(entries)
+        try:
+            with self._locked():
+                with open(self.journal_file, 'ab') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_entries += len(entries)
+                self._journal_offset += len(data)
+                self._write_generation(self._read_generation() + 1)
+        except Exception as e:
+            print(f"Error writing to journal '{self.journal_file}': {e}")
+
+    @staticmethod
+    def _encode_entries(entries):
+        """
+        Returns the journal lines for a list of change entries, as bytes.
+        """
+        return "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries).encode()
+
+    def compact(self, store):
+        """
+        Folds the journal into a fresh snapshot and empties the journal.
+        Replaying entries is idempotent, so a crash between the two steps
+        only means some entries are applied twice on the next start.
+        Runs in its own transaction (or the caller's, if inside one) so the
+        snapshot includes other processes' changes.
+        """
+        with self.transaction(store):
+            if self.save(store) and self.journal:
+                try:
+                    open(self.journal_file, 'w').close()
+                    self._journal_entries = 0
+                    self._journal_offset = 0
+                except Exception as e:
+                    print(f"Error truncating journal '{self.journal_file}': {e}")
+
+    def close(self, store):
+        """
+        Compacts any pending journal entries so the next start loads a
+        single snapshot file.
+        """
+        if self._journal_entries and store is not None:
+            self.compact(store)
+
+
+class SQLiteStorage:
+    """
+    Stores student records in a SQLite database.
+    The table is indexed on student_id, branch and year, every change runs in
+    its own transaction, and WAL mode lets other processes read the roster
+    while it is being written. SQLite's data_version serves as the
+    generation counter for noticing other processes' writes.
+    """
+    def __init__(self, file_name="students.db"):
+        self.file_name = file_name
+        self.connection = sqlite3.connect(file_name, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS students ("
+                "student_id TEXT PRIMARY KEY, name TEXT NOT NULL, branch TEXT NOT NULL, "
+                "year INTEGER NOT NULL, marks REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_students_branch ON students(branch)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_students_year ON students(year)")
+        self._data_version = None
+
+    def _current_data_version(self):
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self, store):
+        """
+        Loads every row of the students table into 'store'.
+        """
+        self._data_version = self._current_data_version()
+        for student in self.stream():
+            store.put(student)
+        print(f"Data loaded successfully from '{self.file_name}'.")
+
+    @contextmanager
+    def transaction(self, store):
+        """
+        Starts a write transaction and reloads 'store' if another connection
+        committed changes since it was loaded. The transaction is committed
+        when the block ends, or rolled back if it raises.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self._current_data_version() != self._data_version:
+                print(f"'{self.file_name}' was changed by another process. Reloading records.")
+                store.clear()
+                self.load(store)
+            yield
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+
+    def stream(self):
+        """
+        Returns an iterator over the stored Students, read with a cursor.
+        """
+        cursor = self.connection.execute(
+            "SELECT student_id, name, branch, year, marks FROM students ORDER BY rowid")
+        return (Student(*row) for row in cursor)
+
+    def record(self, entries, store):
+        """
+        Writes a list of change entries to the database. Inside
+        transaction() they are committed with it; otherwise they get a
+        transaction of their own.
+        """
+        puts = [tuple(e["student"][key] for key in FIELD_NAMES) for e in entries if e["op"] == "put"]
+        deletes = [(e["Student_id"],) for e in entries if e["op"] == "delete"]
+        standalone = not self.connection.in_transaction
+        try:
+            if puts:
+                self.connection.executemany(
+                    "INSERT INTO students (student_id, name, branch, year, marks) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(student_id) DO UPDATE SET name = excluded.name, "
+                    "branch = excluded.branch, year = excluded.year, marks = excluded.marks",
+                    puts)
+            if deletes:
+                self.connection.executemany("DELETE FROM students WHERE student_id = ?", deletes)
+            if standalone:
+                self.connection.commit()
+        except sqlite3.Error as e:
+            if standalone:
+                self.connection.rollback()
+            print(f"Error writing to database '{self.file_name}': {e}")
+            if not standalone:
+                raise
+
+    def compact(self, store):
+        """
+        Checkpoints the write-ahead log into the main database file.
+        A checkpoint can't run inside a transaction, so any open one is
+        committed first.
+        """
+        if self.connection.in_transaction:
+            self.connection.commit()
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self, store):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+
+def _lock_file(handle, shared=False):
+    """
+    Blocks until an OS-level lock on an open file is acquired.
+    Windows has no shared locks, so there every lock is exclusive.
+    """
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    else:
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock_file(handle):
+    """
+    Releases a lock taken with _lock_file.
+    """
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _apply_entry(store, entry):
+    """
+    Applies a single change entry to an in-memory StudentStore.
+    """
+    if entry["op"] == "put":
+        store.put(Student.from_dict(entry["student"]))
+    elif entry["op"] == "delete":
+        store.remove(entry["Student_id"])
+
+
+# Storage backends selectable by name in StudentManager
+STORAGE_BACKENDS = {
+    "json": JsonFileStorage,
+    "sqlite": SQLiteStorage
+}
+
+
+class StudentManager:
+    """
+    Manages the collection of student records, including loading, saving,
+    adding, viewing, updating, and deleting.
+    """
+    def __init__(self, file_name=None, journal=True, compact_threshold=1000, lazy=False,
+                 columnar=False, backend="json", storage=None):
+        # The records are persisted by a storage backend: the JSON snapshot +
+        # journal files by default, or a SQLite database with backend="sqlite".
+        # A ready-made storage object can be passed instead.
+        if storage is None:
+            if backend == "json":
+                storage = JsonFileStorage(file_name or "students.json", journal, compact_threshold)
+            elif backend in STORAGE_BACKENDS:
+                storage = STORAGE_BACKENDS[backend](file_name or "students.db")
+            else:
+                raise ValueError(f"Unknown storage backend '{backend}'.")
+        self.storage = storage
+        self.file_name = storage.file_name
+        # Columnar mode keeps the records in a StudentTable instead of one
+        # Student object each
+        self.columnar = columnar
+        # In lazy mode nothing is loaded until the records are first needed;
+        # until then view/export stream straight from storage
+        self._students = None
+        if not lazy:
+            self._load_data()
+
+    @property
+    def students(self):
+        """
+        The StudentStore holding all records, loaded on first access.
+        """
+        if self._students is None:
+            self._load_data()
+        return self._students
+
+    def _new_store(self, students=None):
+        """
+        Creates an empty or pre-filled StudentStore with the configured backend.
+        """
+        return StudentStore(students, records=StudentTable() if self.columnar else None)
+
+    def _load_data(self):
+        """
+        Loads student data from storage into the 'students' store.
+        """
+        self._students = self._new_store()
+        self.storage.load(self._students)
+
+    def _transaction(self):
+        """
+        Returns a context manager that locks the storage for writing and
+        first merges in changes other processes made to it. Mutations are
+        validated, applied and recorded inside it so none are lost.
+        """
+        return self.storage.transaction(self.students)
+
+    def _record_changes(self, entries):
+        """
+        Persists a list of change entries through the storage backend.
+        The entries must already be applied to the in-memory store.
+        """
+        self.storage.record(entries, self.students)
+
+    def _record_put(self, student):
+        """
+        Records that a Student was added or changed.
+        """
+        self._record_changes([{"op": "put", "student": student.to_dict()}])
+
+    def _record_delete(self, student_id):
+        """
+        Records that the Student with the given ID was deleted.
+        """
+        self._record_changes([{"op": "delete", "Student_id": student_id}])
+
+    def compact(self):
+        """
+        Asks the storage backend to fold pending changes into its main file.
+        Each backend takes its own lock for this.
+        """
+        self.storage.compact(self.students)
+
+    def close(self):
+        """
+        Flushes pending changes and releases the storage backend.
+        """
+        self.storage.close(self._students)
+
+    def iter_students(self):
+        """
+        Yields every student record.
+        If nothing has been loaded yet (lazy mode) and the storage can stream
+        its records, they are read without building the in-memory store.
+        """
+        if self._students is None:
+            records = self.storage.stream()
+            if records is not None:
+                yield from records
+                return
+        yield from self.students
+
+    def query(self, branch=None, year=None, min_marks=None, max_marks=None,
+              sort_by=None, descending=False, limit=None):
+        """
+        Returns the Students matching the given branch, year and marks range.
+        Branch/year use the secondary indexes. Results can be sorted by any
+        Student attribute; with a limit only the best 'limit' records are
+        kept (using a heap) instead of sorting everything.
+        """
+        if min_marks is not None or max_marks is not None:
+            low = float("-inf") if min_marks is None else min_marks
+            high = float("inf") if max_marks is None else max_marks
+            if branch is None and year is None:
+                results = self.students.marks_between(low, high)
+            else:
+                results = [s for s in self.students.filter(branch=branch, year=year) if low <= s.marks <= high]
+        else:
+            results = self.students.filter(branch=branch, year=year)
+        if sort_by is not None:
+            key = lambda s: getattr(s, sort_by)
+            if limit is not None:
+                pick = heapq.nlargest if descending else heapq.nsmallest
+                return pick(limit, results, key=key)
+            results.sort(key=key, reverse=descending)
+        if limit is not None:
+            results = results[:limit]
+        return results
+
+    def top_n(self, n, branch=None, year=None):
+        """
+        Returns the n Students with the highest marks, best first.
+        """
+        return self.query(branch=branch, year=year, sort_by="marks", descending=True, limit=n)
+
+    def marks_stats(self, group_by=None, percentiles=(25, 50, 75)):
+        """
+        Returns count, mean, min, max and percentiles of marks, either for
+        all records or as a dict keyed by each value of 'group_by'
+        ("branch" or "year"). The statistics are maintained as records
+        change, so this does not scan the roster.
+        """
+        stats = self.students.stats(group_by)
+        if group_by is None:
+            return stats.summary(percentiles)
+        return {key: group.summary(percentiles) for key, group in stats.items()}
 
     def _find_student(self, student_id):
         """
         Helper method to find a student by their ID.
         Returns the Student object if found, None otherwise.
         """
-        for student in self.students:
-            if student.student_id == student_id:
-                return student
-        return None
+        return self.students.get(student_id)
 
     def _get_string_input(self, prompt, allow_empty=False):
         """
@@ -168,66 +1079,59 @@ class StudentManager:
         marks = self._get_float_input("Enter Marks (0-100): ", min_val=0, max_val=100)
 
         new_student = Student(student_id, name, branch, year, marks)
-        self.students.append(new_student)
-        self._save_data()
+        with self._transaction():
+            # Another terminal may have taken the ID while we were prompting
+            if student_id in self.students:
+                print(f"Student with ID '{student_id}' was added by another user in the meantime. "
+                      "Record not saved.")
+                return
+            self.students.add(new_student)
+            self._record_put(new_student)
         print(f"Student '{name}' (ID: {student_id}) added successfully!")
 
-    def view_students(self):
+    def view_students(self, page_size=None, offset=0):
         """
-        Displays all student records in a formatted tabular layout.
+        Displays student records in a formatted tabular layout.
+        With a page_size the records are shown one page at a time, starting
+        after 'offset' records. Column widths come from the store's cached
+        widths; when streaming from the file they are sampled from the rows
+        seen so far. Output is written to stdout in buffered chunks.
         """
         print("\n--- All Student Records ---")
-        if not self.students:
+        records = self.iter_students()
+        if offset:
+            records = islice(records, offset, None)
+        first = next(records, None)
+        if first is None:
             print("No student records found.")
             return
+        records = chain([first], records)
 
-        headers = ["ID", "Name", "Branch", "Year", "Marks"]
-        
-        # Calculate maximum width for each column dynamically, including headers
-        col_widths = {
-            "ID": max(len(s.student_id) for s in self.students) if self.students else 0,
-            "Name": max(len(s.name) for s in self.students) if self.students else 0,
-            "Branch": max(len(s.branch) for s in self.students) if self.students else 0,
-            "Year": max(len(str(s.year)) for s in self.students) if self.students else 0,
-            "Marks": max(len(str(s.marks)) for s in self.students) if self.students else 0
-        }
-
-        # Ensure header width is respected if content is shorter
-        col_widths["ID"] = max(col_widths["ID"], len("ID"))
-        col_widths["Name"] = max(col_widths["Name"], len("Name"))
-        col_widths["Branch"] = max(col_widths["Branch"], len("Branch"))
-        col_widths["Year"] = max(col_widths["Year"], len("Year"))
-        col_widths["Marks"] = max(col_widths["Marks"], len("Marks"))
-        
-        # Add some padding
-        padding = 2
-        for key in col_widths:
-            col_widths[key] += padding
-
-        # Print header
-        header_line_format = (
-            f"{{:<{col_widths['ID']}}}"
-            f"{{:<{col_widths['Name']}}}"
-            f"{{:<{col_widths['Branch']}}}"
-            f"{{:<{col_widths['Year']}}}"
-            f"{{:<{col_widths['Marks']}}}"
-        )
-        print(header_line_format.format("ID", "Name", "Branch", "Year", "Marks"))
-        print("-" * sum(col_widths.values()))
-
-        # Print each student record
-        for student in self.students:
-            print(
-                header_line_format.format(
-                    student.student_id,
-                    student.name,
-                    student.branch,
-                    str(student.year),
-                    str(student.marks)
-                )
-            )
-        print("-" * sum(col_widths.values()))
+        streaming = self._students is None
+        widths = None if streaming else self._students.column_widths()
+        row_format = separator = None
+        for number, chunk in enumerate(_batches(records, page_size or RENDER_CHUNK_ROWS)):
+            if page_size and number:
+                answer = input("Press Enter for the next page or 'q' to stop: ").strip().lower()
+                if answer == 'q':
+                    break
+            if streaming:
+                widths = _merge_widths(widths, chunk)
+            if row_format is None or streaming:
+                row_format, separator = _table_format(widths)
 
+            lines = []
+            if page_size or number == 0:
+                lines.append(row_format.format(*TABLE_COLUMNS))
+                lines.append(separator)
+            lines.extend(row_format.format(s.student_id, s.name, s.branch, str(s.year), str(s.marks))
+                         for s in chunk)
+            if page_size:
+                lines.append(separator)
+            sys.stdout.write("\n".join(lines) + "\n")
+        if not page_size:
+            sys.stdout.write(separator + "\n")
+        sys.stdout.flush()
 
     def update_student(self):
         """
@@ -242,23 +1146,30 @@ class StudentManager:
             print(f"Found student: {student}")
             print("Enter new details (leave blank to keep current value):")
 
+            changes = {}
             new_name = self._get_string_input(f"Enter new Name ({student.name}): ", allow_empty=True)
             if new_name:
-                student.name = new_name
+                changes["name"] = new_name
 
             new_branch = self._get_string_input(f"Enter new Branch ({student.branch}): ", allow_empty=True)
             if new_branch:
-                student.branch = new_branch
+                changes["branch"] = new_branch
 
             new_year = self._get_int_input(f"Enter new Year ({student.year}): ", min_val=1, allow_empty=True)
             if new_year is not None:
-                student.year = new_year
+                changes["year"] = new_year
 
             new_marks = self._get_float_input(f"Enter new Marks ({student.marks}): ", min_val=0, max_val=100, allow_empty=True)
             if new_marks is not None:
-                student.marks = new_marks
+                changes["marks"] = new_marks
 
-            self._save_data()
+            with self._transaction():
+                # Update through the store so the branch/year indexes stay in sync
+                student = self.students.update(student_id, **changes)
+                if student is None:
+                    print(f"Student with ID '{student_id}' was deleted by another user in the meantime.")
+                    return
+                self._record_put(student)
             print(f"Student with ID '{student_id}' updated successfully!")
         else:
             print(f"Student with ID '{student_id}' not found.")
@@ -277,14 +1188,310 @@ class StudentManager:
             print(f"Found student: {student_to_delete}")
             confirm = input(f"Are you sure you want to delete student with ID '{student_id}'? (yes/no): ").strip().lower()
             if confirm == 'yes':
-                self.students = [s for s in self.students if s.student_id != student_id]
-                self._save_data()
+                with self._transaction():
+                    if self.students.remove(student_id) is None:
+                        print(f"Student with ID '{student_id}' was already deleted by another user.")
+                        return
+                    self._record_delete(student_id)
                 print(f"Student with ID '{student_id}' deleted successfully!")
             else:
                 print(f"Deletion cancelled for student with ID '{student_id}'.")
         else:
             print(f"Student with ID '{student_id}' not found.")
 
+    def _coerce_fields(self, record):
+        """
+        Converts a dict using either file keys ("Student_id", ...) or attribute
+        names ("student_id", ...) into validated attribute values.
+        Raises ValueError if a value has the wrong type or is out of range.
+        """
+        fields = {}
+        for key, value in record.items():
+            field = FIELD_NAMES.get(key, key)
+            if field not in FIELD_NAMES.values():
+                raise ValueError(f"Unknown field '{key}'.")
+            fields[field] = value
+        for field in ("student_id", "name", "branch"):
+            if field in fields:
+                fields[field] = str(fields[field]).strip()
+                if not fields[field]:
+                    raise ValueError(f"'{field}' cannot be empty.")
+        if "year" in fields:
+            fields["year"] = int(fields["year"])
+            if fields["year"] < 1:
+                raise ValueError(f"Year must be at least 1, got {fields['year']}.")
+        if "marks" in fields:
+            fields["marks"] = float(fields["marks"])
+            if not 0 <= fields["marks"] <= 100:
+                raise ValueError(f"Marks must be between 0 and 100, got {fields['marks']}.")
+        return fields
+
+    def _coerce_student(self, item):
+        """
+        Returns a validated Student built from a Student or a dict.
+        """
+        if isinstance(item, (Student, StudentRow)):
+            item = item.to_dict()
+        fields = self._coerce_fields(item)
+        missing = [f for f in FIELD_NAMES.values() if f not in fields]
+        if missing:
+            raise ValueError(f"Missing field(s): {', '.join(missing)}.")
+        return Student(fields["student_id"], fields["name"], fields["branch"],
+                       fields["year"], fields["marks"])
+
+    def bulk_add(self, records):
+        """
+        Adds an iterable of Students or dicts without prompting.
+        The whole batch is validated against the existing IDs before any
+        record is added, and the changes are persisted in one write.
+        Returns the number of records added; raises ValueError on bad input.
+        """
+        new_students = [self._coerce_student(item) for item in records]
+        with self._transaction():
+            seen = set()
+            for student in new_students:
+                if student.student_id in seen or student.student_id in self.students:
+                    raise ValueError(f"Student with ID '{student.student_id}' already exists.")
+                seen.add(student.student_id)
+
+            for student in new_students:
+                self.students.add(student)
+            if new_students:
+                self._record_changes([{"op": "put", "student": s.to_dict()} for s in new_students])
+        return len(new_students)
+
+    def bulk_update(self, records):
+        """
+        Updates existing records from an iterable of Students or dicts.
+        Dicts only need 'Student_id' plus the fields that change.
+        Every ID must already exist, otherwise nothing is changed.
+        Returns the number of records updated; raises ValueError on bad input.
+        """
+        updates = []
+        for item in records:
+            if isinstance(item, (Student, StudentRow)):
+                item = item.to_dict()
+            fields = self._coerce_fields(item)
+            student_id = fields.pop("student_id", None)
+            if student_id is None:
+                raise ValueError("Every update needs a 'Student_id'.")
+            updates.append((student_id, fields))
+
+        with self._transaction():
+            for student_id, fields in updates:
+                if student_id not in self.students:
+                    raise ValueError(f"Student with ID '{student_id}' not found.")
+
+            entries = []
+            for student_id, fields in updates:
+                student = self.students.update(student_id, **fields)
+                entries.append({"op": "put", "student": student.to_dict()})
+            if entries:
+                self._record_changes(entries)
+        return len(entries)
+
+    def bulk_delete(self, student_ids):
+        """
+        Deletes the records with the given IDs.
+        Every ID must exist, otherwise nothing is deleted.
+        Returns the number of records deleted; raises ValueError on bad input.
+        """
+        student_ids = list(dict.fromkeys(str(i).strip() for i in student_ids))
+        with self._transaction():
+            unknown = [i for i in student_ids if i not in self.students]
+            if unknown:
+                raise ValueError(f"Student with ID '{unknown[0]}' not found.")
+
+            for student_id in student_ids:
+                self.students.remove(student_id)
+            if student_ids:
+                self._record_changes([{"op": "delete", "Student_id": i} for i in student_ids])
+        return len(student_ids)
+
+
+def _display_widths(student):
+    """
+    Returns the printed width of each table column for one Student.
+    """
+    return (len(student.student_id), len(student.name), len(student.branch),
+            len(str(student.year)), len(str(student.marks)))
+
+
+def _merge_widths(widths, students):
+    """
+    Widens a dict of column widths (or None) to fit the given Students.
+    """
+    widths = dict(widths) if widths else {header: 0 for header in TABLE_COLUMNS}
+    for student in students:
+        for header, width in zip(TABLE_COLUMNS, _display_widths(student)):
+            if width > widths[header]:
+                widths[header] = width
+    return widths
+
+
+def _table_format(widths):
+    """
+    Builds the row format string and separator line for the given column
+    widths. Headers always fit and every column gets two spaces of padding.
+    """
+    padding = 2
+    sizes = [max(widths[header], len(header)) + padding for header in TABLE_COLUMNS]
+    row_format = "".join(f"{{:<{size}}}" for size in sizes)
+    return row_format, "-" * sum(sizes)
+
+
+def _iter_json_array(f, chunk_size=1 << 16):
+    """
+    Incrementally parses a JSON array from a file, yielding one element at a
+    time. Only a chunk of the file is kept in memory at once.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise json.JSONDecodeError("Expected a JSON array", buffer, 0)
+    pos = 1
+    while True:
+        # Skip the separators between elements, reading more when needed
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            buffer, pos = f.read(chunk_size), 0
+            if not buffer:
+                raise json.JSONDecodeError("Unterminated JSON array", "", 0)
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # The element is cut off at the end of the buffer
+            more = f.read(chunk_size)
+            if not more:
+                raise
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield item
+        pos = end
+
+
+def read_records(path):
+    """
+    Yields one dict per record from a CSV, JSONL or JSON array file.
+    CSV is chosen by extension; JSON files are told apart from JSONL by
+    their first character. Records are read incrementally.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'r', newline='') as f:
+        if extension == ".csv":
+            yield from csv.DictReader(f)
+            return
+        first_char = f.read(1)
+        while first_char.isspace():
+            first_char = f.read(1)
+        f.seek(0)
+        if first_char == "[":
+            yield from _iter_json_array(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def read_students(path):
+    """
+    Yields a Student for every record in a data file, one at a time.
+    """
+    for record in read_records(path):
+        yield Student.from_dict(record)
+
+
+def write_records(path, students, format_path=None, sync=False):
+    """
+    Writes Students to a CSV, JSONL or JSON array file, one record at a time.
+    The format follows the extension of 'format_path' (default: 'path').
+    With sync=True the file is flushed to disk before returning.
+    Returns the number of records written.
+    """
+    extension = os.path.splitext(format_path or path)[1].lower()
+    count = 0
+    with open(path, 'w', newline='') as f:
+        if extension == ".csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELD_NAMES)
+            for student in students:
+                writer.writerow(student.to_row())
+                count += 1
+        elif extension in (".jsonl", ".ndjson"):
+            for student in students:
+                f.write(json.dumps(student.to_dict(), separators=(",", ":")) + "\n")
+                count += 1
+        else:
+            f.write("[")
+            for student in students:
+                f.write((",\n" if count else "\n") + json.dumps(student.to_dict()))
+                count += 1
+            f.write("\n]\n")
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    return count
+
+
+def _batches(iterable, size):
+    """
+    Splits an iterable into lists of at most 'size' items.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_records(manager, path, mode="add", batch_size=10000):
+    """
+    Streams records from 'path' into the manager in batches.
+    'mode' is one of "add", "update" or "delete"; each batch is validated
+    and persisted as a unit. Returns the number of records processed.
+    """
+    apply_batch = {
+        "add": manager.bulk_add,
+        "update": manager.bulk_update,
+        "delete": lambda batch: manager.bulk_delete(r.get("Student_id", r.get("student_id")) for r in batch)
+    }[mode]
+    total = 0
+    for batch in _batches(read_records(path), batch_size):
+        total += apply_batch(batch)
+    return total
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+# Hot paths wrapped when instrumentation is on: (class, or None for this
+# module's functions; category; names or (name, byte counter) pairs). A
+# byte counter gets the call's result and arguments and returns the
+# (read, written) bytes.
+INSTRUMENTED_CALLS = [
+    (StudentManager, "students", ["_load_data", "_record_changes", "compact", "close"]),
+    (JsonFileStorage, "storage", [
+        ("load", lambda result, a: (_file_size(a["self"].file_name) + a["self"]._journal_offset, 0)),
+        ("save", lambda result, a: (0, _file_size(a["self"].file_name) if result else 0)),
+        # A record that compacts instead leaves the journal empty; save counts it
+        ("record", lambda result, a: (0, len(a["self"]._encode_entries(a["entries"]))
+                                      if a["self"]._journal_entries else 0)),
+        "compact",
+    ]),
+    (SQLiteStorage, "storage", ["load", "record", "compact"]),
+    (None, "students", [
+        ("import_records", lambda result, a: (_file_size(a["path"]), 0)),
+        ("write_records", lambda result, a: (0, _file_size(a["path"]))),
+    ]),
+]
+
+
 def display_menu():
     """
     Displays the main menu options to the user.
@@ -297,11 +1504,72 @@ def display_menu():
     print("5. Exit")
     print("----------------------------------------")
 
-def main():
+def parse_args(argv=None):
+    """
+    Parses the command line. With no sub-command the interactive menu runs.
+    """
+    parser = argparse.ArgumentParser(description="Student Record Management System")
+    parser.add_argument("--data-file", default=None,
+                        help="Student data file: JSON array or .jsonl for the json backend "
+                             "(default: students.json), a database for sqlite (default: students.db)")
+    parser.add_argument("--backend", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="Storage backend (default: json)")
+    parser.add_argument("--lazy", action="store_true",
+                        help="Load records only when a change is made; viewing streams from the file")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Keep records in compact columns instead of one object each")
+    parser.add_argument("--page-size", type=int, default=None,
+                        help="Show this many records per page when viewing")
+    parser.add_argument("--offset", type=int, default=0,
+                        help="Skip this many records when viewing")
+    if instrumentation is not None:
+        instrumentation.add_arguments(parser, "the persistence paths")
+    commands = parser.add_subparsers(dest="command")
+
+    import_parser = commands.add_parser("import", help="Import records from a CSV/JSONL/JSON file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--mode", choices=["add", "update", "delete"], default="add")
+    import_parser.add_argument("--batch-size", type=int, default=10000)
+
+    export_parser = commands.add_parser("export", help="Export records to a CSV/JSONL/JSON file")
+    export_parser.add_argument("path")
+    return parser.parse_args(argv)
+
+def run_command(args):
+    """
+    Runs a non-interactive import or export and reports the throughput.
+    Returns the process exit code.
+    """
+    manager = StudentManager(args.data_file, lazy=True, columnar=args.columnar,
+                             backend=args.backend)
+    start = time.perf_counter()
+    try:
+        if args.command == "import":
+            count = import_records(manager, args.path, args.mode, args.batch_size)
+            manager.close()
+        else:
+            count = write_records(args.path, manager.iter_students())
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error during {args.command} of '{args.path}': {e}")
+        manager.close()
+        return 1
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{args.command.capitalize()}ed {count} record(s) in {elapsed:.2f}s ({rate:.0f} records/s).")
+    return 0
+
+def main(argv=None):
     """
     Main function to run the student record management application.
     """
-    manager = StudentManager()
+    args = parse_args(argv)
+    if instrumentation is not None:
+        instrumentation.install_from_args(args, __name__, "students", INSTRUMENTED_CALLS)
+    if args.command:
+        sys.exit(run_command(args))
+
+    manager = StudentManager(args.data_file, lazy=args.lazy, columnar=args.columnar,
+                             backend=args.backend)
 
     while True:
         display_menu()
@@ -310,12 +1578,13 @@ def main():
         if choice == '1':
             manager.add_student()
         elif choice == '2':
-            manager.view_students()
+            manager.view_students(args.page_size, args.offset)
         elif choice == '3':
             manager.update_student()
         elif choice == '4':
             manager.delete_student()
         elif choice == '5':
+            manager.close()
             print("Exiting Student Record Management System. Goodbye!")
             break
         else:
@@ -0,0 +1,83 @@
+import importlib.util
+import os
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Student_Record_Management_Console_App.py")
+spec = importlib.util.spec_from_file_location("student_app", SCRIPT)
+student_app = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(student_app)
+
+
+def make_records(count, start=0):
+    return [{"Student_id": f"S{i}", "Name": f"Student {i}", "Branch": "CSE", "Year": 2, "Marks": 80}
+            for i in range(start, start + count)]
+
+
+@pytest.mark.parametrize("backend, file_name", [("sqlite", "students.db"), ("json", "students.json")])
+def test_compact_keeps_records(tmp_path, backend, file_name):
+    path = str(tmp_path / file_name)
+    manager = student_app.StudentManager(path, backend=backend)
+    manager.bulk_add(make_records(10))
+    manager.compact()
+    manager.bulk_add(make_records(5, start=10))
+    manager.compact()
+    manager.close()
+
+    reopened = student_app.StudentManager(path, backend=backend)
+    assert sorted(s.student_id for s in reopened.iter_students()) == sorted(f"S{i}" for i in range(15))
+    reopened.close()
+
+
+def test_bulk_import_rewrites_snapshot_a_logarithmic_number_of_times(tmp_path, monkeypatch):
+    manager = student_app.StudentManager(str(tmp_path / "students.json"), lazy=True)
+    saves = []
+    save = manager.storage.save
+    monkeypatch.setattr(manager.storage, "save", lambda store: saves.append(len(store)) or save(store))
+    for start in range(0, 32000, 2000):
+        manager.bulk_add(make_records(2000, start=start))
+    manager.close()
+    # The snapshot is rewritten whenever the journal catches up with it, so
+    # its size doubles each time
+    assert saves == [2000, 4000, 8000, 16000, 32000]
+    assert len(student_app.StudentManager(str(tmp_path / "students.json")).students) == 32000
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_column_widths_follow_changes(columnar):
+    store = student_app.StudentStore(records=student_app.StudentTable() if columnar else None)
+    for record in make_records(3):
+        store.put(student_app.Student.from_dict(record))
+    store.column_widths()
+    store.update("S0", marks=100)
+    store.put(student_app.Student.from_dict(dict(make_records(1, start=3)[0], Name="A much longer name")))
+    store.remove("S1")
+    store.remove("S3")
+    expected = student_app._merge_widths(None, list(store))
+    assert store.column_widths() == expected
+    assert expected["Name"] == len("Student 0")
+    assert expected["Marks"] == len(str(store.get("S0").marks))
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_adding_after_a_view_keeps_indexes(columnar):
+    store = student_app.StudentStore(records=student_app.StudentTable() if columnar else None)
+    for record in make_records(3):
+        store.put(student_app.Student.from_dict(record))
+    store.column_widths()
+    store.add(student_app.Student.from_dict(dict(make_records(1, start=3)[0], Name="A much longer name")))
+    assert len(store.find_by("branch", "CSE")) == 4
+    assert store.column_widths() == student_app._merge_widths(None, list(store))
+    assert store.column_widths()["Name"] == len("A much longer name")
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_query_by_marks_range(tmp_path, columnar):
+    manager = student_app.StudentManager(str(tmp_path / "students.json"), columnar=columnar)
+    manager.bulk_add([dict(record, Marks=i * 10, Branch="CSE" if i % 2 else "ECE")
+                      for i, record in enumerate(make_records(10))])
+    manager.students.remove("S0")  # Moves the last row into the freed slot of a StudentTable
+    assert sorted(s.student_id for s in manager.query(min_marks=30, max_marks=70)) == ["S3", "S4", "S5", "S6", "S7"]
+    assert sorted(s.student_id for s in manager.query(max_marks=20)) == ["S1", "S2"]
+    assert [s.student_id for s in manager.query(branch="CSE", min_marks=50, sort_by="marks")] == ["S5", "S7", "S9"]
+    manager.close()
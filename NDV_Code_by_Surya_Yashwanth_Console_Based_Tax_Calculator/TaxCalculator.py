@@ -1,21 +1,292 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from itertools import islice
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # The batch functions fall back to pure Python
+    np = None
+
+# The shared opt-in instrumentation lives with the benchmarks; without it
+# (e.g. the app copied on its own) the --instrument flags are not offered
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "NDV_Code_By_Surya_Yashwanth_Benchmarks"))
+try:
+    import instrumentation
+except ImportError:
+    instrumentation = None
+
+# Slab tables for every regime and fiscal year live in this file (JSON, or
+# TOML when the path ends in .toml)
+DEFAULT_REGIMES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tax_regimes.json")
+# Fiscal year of the regimes used by the console calculator
+DEFAULT_FISCAL_YEAR = "simplified"
+
+
+class TaxRegime:
+    """
+    A tax regime built from a declarative slab table.
+    The cumulative tax at the lower bound of every slab is computed once, so
+    the tax on any income is a binary search for its slab plus one multiply,
+    O(log slabs) per income. Standard deduction, capped deductions, rebate,
+    surcharge and cess are all optional parts of the table.
+    """
+    def __init__(self, name, fiscal_year, slabs, standard_deduction=0, deduction_limits=None,
+                 rebate=None, surcharge=None, cess_rate=0.0, description=""):
+        self.name = name
+        self.fiscal_year = fiscal_year
+        self.description = description
+        self.bounds = [lower for lower, _ in slabs]
+        self.rates = [rate for _, rate in slabs]
+        if self.bounds[0] != 0 or self.bounds != sorted(self.bounds):
+            raise ValueError(f"Slabs of regime '{name}' ({fiscal_year}) must start at 0 and be sorted.")
+        self.cumulative = [0.0]
+        for lower, upper, rate in zip(self.bounds, self.bounds[1:], self.rates):
+            self.cumulative.append(self.cumulative[-1] + (upper - lower) * rate)
+        self.standard_deduction = standard_deduction
+        # Deductions a taxpayer may claim on top of the standard deduction,
+        # by section, with the most that can be claimed under each
+        self.deduction_limits = dict(deduction_limits or {})
+        self.rebate = rebate
+        # (income threshold, rate) pairs; the highest threshold crossed applies
+        self.surcharge = sorted(surcharge or [])
+        self.cess_rate = cess_rate
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates a TaxRegime from one entry of the regimes file.
+        """
+        return cls(
+            data["name"],
+            data["fiscal_year"],
+            [tuple(slab) for slab in data["slabs"]],
+            standard_deduction=data.get("standard_deduction", 0),
+            deduction_limits=data.get("deduction_limits"),
+            rebate=data.get("rebate"),
+            surcharge=[tuple(band) for band in data.get("surcharge", [])],
+            cess_rate=data.get("cess_rate", 0.0),
+            description=data.get("description", "")
+        )
+
+    def allowed_deductions(self, deductions=None):
+        """
+        Returns the deduction amount this regime allows.
+        'deductions' is either a dict of section -> amount claimed, each
+        capped at the regime's limit (unknown sections are ignored), or a
+        single total, capped at the sum of all limits.
+        """
+        if not deductions:
+            return 0
+        if isinstance(deductions, dict):
+            return sum(min(amount, self.deduction_limits[section])
+                       for section, amount in deductions.items() if section in self.deduction_limits)
+        return min(deductions, sum(self.deduction_limits.values()))
+
+    def taxable_income(self, income, deductions=None):
+        """
+        Returns the income left after the standard and allowed deductions.
+        """
+        return max(0, income - self.standard_deduction - self.allowed_deductions(deductions))
+
+    def tax(self, income, deductions=None):
+        """
+        Calculates the tax on a single income.
+        """
+        taxable_income = self.taxable_income(income, deductions)
+        slab = max(bisect_left(self.bounds, taxable_income) - 1, 0)
+        tax = self.cumulative[slab] + (taxable_income - self.bounds[slab]) * self.rates[slab]
+        if self.rebate and taxable_income <= self.rebate["max_taxable_income"]:
+            tax = max(0, tax - self.rebate["max_rebate"])
+        for threshold, rate in reversed(self.surcharge):
+            if taxable_income > threshold:
+                tax += tax * rate
+                break
+        return tax + tax * self.cess_rate if self.cess_rate else tax
+
+    def tax_batch(self, incomes, deductions=0):
+        """
+        Calculates the tax on a sequence or NumPy array of incomes.
+        'deductions' is a total (or an array of totals, one per income) and
+        is capped at the sum of the regime's deduction limits.
+        Returns a NumPy array when NumPy is available, otherwise a list.
+        """
+        if np is None:
+            if isinstance(deductions, (int, float)):
+                return [self.tax(income, deductions) for income in incomes]
+            return [self.tax(income, claimed) for income, claimed in zip(incomes, deductions)]
+
+        allowed = np.minimum(deductions, sum(self.deduction_limits.values()))
+        taxable_incomes = np.maximum(np.asarray(incomes, dtype=float) - self.standard_deduction - allowed, 0)
+        slab = np.maximum(np.searchsorted(self.bounds, taxable_incomes, side='left') - 1, 0)
+        tax = (np.asarray(self.cumulative)[slab]
+               + (taxable_incomes - np.asarray(self.bounds, dtype=float)[slab]) * np.asarray(self.rates)[slab])
+        if self.rebate:
+            rebated = np.maximum(tax - self.rebate["max_rebate"], 0)
+            tax = np.where(taxable_incomes <= self.rebate["max_taxable_income"], rebated, tax)
+        if self.surcharge:
+            thresholds = [threshold for threshold, _ in self.surcharge]
+            band_rates = np.array([0.0] + [rate for _, rate in self.surcharge])
+            tax = tax + tax * band_rates[np.searchsorted(thresholds, taxable_incomes, side='left')]
+        if self.cess_rate:
+            tax = tax + tax * self.cess_rate
+        return tax
+
+    def breakpoints(self, deductions=None):
+        """
+        Returns the gross incomes at which the tax can change slope or jump:
+        slab bounds, the rebate limit and the point where the rebate is used
+        up, and surcharge thresholds. Between two consecutive points the tax
+        is a linear function of the income.
+        """
+        offset = self.standard_deduction + self.allowed_deductions(deductions)
+        points = [offset + bound for bound in self.bounds]
+        points += [offset + threshold for threshold, _ in self.surcharge]
+        if self.rebate:
+            points.append(offset + self.rebate["max_taxable_income"])
+            # The max(0, tax - rebate) kink: where the slab tax equals the rebate
+            rebate = self.rebate["max_rebate"]
+            upper = self.cumulative[1:] + [float("inf")]
+            for bound, cumulative, next_cumulative, rate in zip(self.bounds, self.cumulative, upper, self.rates):
+                if rate and cumulative <= rebate < next_cumulative:
+                    points.append(offset + bound + (rebate - cumulative) / rate)
+        return sorted(set(points))
+
+    def __repr__(self):
+        return f"TaxRegime({self.name!r}, {self.fiscal_year!r})"
+
+
+def load_regimes(path=DEFAULT_REGIMES_FILE):
+    """
+    Reads a regimes file and returns a dict of (name, fiscal_year) -> TaxRegime.
+    """
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    return {(entry["name"], entry["fiscal_year"]): TaxRegime.from_dict(entry) for entry in data["regimes"]}
+
+REGIMES = load_regimes()
+
+def get_regime(name, fiscal_year=DEFAULT_FISCAL_YEAR):
+    """
+    Returns the registered TaxRegime with the given name and fiscal year.
+    """
+    try:
+        return REGIMES[(name, fiscal_year)]
+    except KeyError:
+        raise ValueError(f"No '{name}' regime defined for fiscal year '{fiscal_year}'.") from None
+
+def compare_regimes(incomes, regimes=None, deductions=0):
+    """
+    Calculates the tax on the same incomes under several regimes.
+    Returns a dict of (name, fiscal_year) -> taxes, one batch per regime.
+    """
+    if regimes is None:
+        regimes = REGIMES.values()
+    if np is not None:
+        incomes = np.asarray(incomes, dtype=float)
+    else:
+        incomes = list(incomes)
+    return {(regime.name, regime.fiscal_year): regime.tax_batch(incomes, deductions) for regime in regimes}
+
+def break_even_incomes(regime_a=None, regime_b=None, deductions=None):
+    """
+    Finds the gross incomes at which the cheaper of two regimes changes
+    (by default the old and new regimes of DEFAULT_FISCAL_YEAR).
+    Both taxes are linear between the regimes' breakpoints, so on each
+    interval the difference is solved for zero exactly instead of searching
+    over incomes. Returns a list of (income, cheaper regime above that
+    income) tuples, where the regime is None if both cost the same.
+    """
+    regime_a = regime_a or get_regime("old")
+    regime_b = regime_b or get_regime("new")
+    points = sorted(set([0.0] + [p for p in regime_a.breakpoints(deductions) + regime_b.breakpoints(deductions)
+                                 if p > 0]))
+
+    def difference(income):
+        return regime_a.tax(income, deductions) - regime_b.tax(income, deductions)
+
+    def cheaper(sign):
+        return regime_b if sign > 0 else regime_a if sign < 0 else None
+
+    tolerance = 1e-6
+    transitions = []
+    state = "unset"
+    # The last interval, past every breakpoint, has no end (None)
+    for start, end in zip(points, points[1:] + [None]):
+        # The difference is linear on (start, end); two interior samples give
+        # its slope and its value just after 'start'
+        width = end - start if end is not None else 1e6
+        x1, x2 = start + width / 4, start + 3 * width / 4
+        d1, d2 = difference(x1), difference(x2)
+        slope = (d2 - d1) / (x2 - x1)
+        at_start = d1 - slope * (x1 - start)
+        if abs(at_start) > tolerance:
+            sign = 1 if at_start > 0 else -1
+        else:
+            sign = 0 if abs(slope) < 1e-12 else (1 if slope > 0 else -1)
+        if state == "unset":
+            state = sign
+        elif sign != state:
+            transitions.append((start, cheaper(sign)))
+            state = sign
+        if abs(at_start) > tolerance and slope and (at_start > 0) != (slope > 0):
+            root = start - at_start / slope
+            if end is None or root < end:
+                state = -sign
+                transitions.append((root, cheaper(state)))
+    return transitions
+
+def regime_sweep(ctcs, bonuses, deductions=(0,), fiscal_year=DEFAULT_FISCAL_YEAR, as_frame=True):
+    """
+    Compares the old and new regimes over every combination of CTC, bonus
+    and claimed deductions, fully vectorized.
+    Returns a pandas DataFrame when pandas is installed and as_frame is set,
+    otherwise a dict of NumPy arrays, with one row per combination.
+    """
+    if np is None:
+        raise ImportError("regime_sweep needs NumPy.")
+    ctc_grid, bonus_grid, deduction_grid = (grid.ravel() for grid in np.meshgrid(
+        np.asarray(ctcs, dtype=float), np.asarray(bonuses, dtype=float),
+        np.asarray(deductions, dtype=float), indexing='ij'))
+    incomes = ctc_grid + bonus_grid
+    old_tax = get_regime("old", fiscal_year).tax_batch(incomes, deduction_grid)
+    new_tax = get_regime("new", fiscal_year).tax_batch(incomes, deduction_grid)
+    result = {
+        "ctc": ctc_grid,
+        "bonus": bonus_grid,
+        "deductions": deduction_grid,
+        "total_income": incomes,
+        "old_regime_tax": old_tax,
+        "new_regime_tax": new_tax,
+        "savings_with_new": old_tax - new_tax,
+        "better_regime": np.where(old_tax < new_tax, "old", np.where(new_tax < old_tax, "new", "same"))
+    }
+    if as_frame:
+        try:
+            import pandas as pd
+        except ImportError:
+            return result
+        return pd.DataFrame(result)
+    return result
+
 # Function to calculate tax under the Old Regime
 def calculate_old_regime_tax(income):
     """
     Calculates tax based on a simplified Old Regime structure.
     Assumes a standard deduction of Rs. 50,000.
     """
-    taxable_income = max(0, income - 50000) # Apply standard deduction
-
-    tax = 0
-    if taxable_income <= 250000:
-        tax = 0
-    elif taxable_income <= 500000:
-        tax = (taxable_income - 250000) * 0.05
-    elif taxable_income <= 1000000:
-        tax = (250000 * 0.05) + (taxable_income - 500000) * 0.20
-    else:
-        tax = (250000 * 0.05) + (500000 * 0.20) + (taxable_income - 1000000) * 0.30
-    return tax
+    return get_regime("old").tax(income)
 
 # Function to calculate tax under the New Regime
 def calculate_new_regime_tax(income):
@@ -23,27 +294,181 @@ def calculate_new_regime_tax(income):
     Calculates tax based on a simplified New Regime structure.
     No standard deductions are applied in this regime.
     """
-    tax = 0
-    if income <= 300000:
-        tax = 0
-    elif income <= 600000:
-        tax = (income - 300000) * 0.05
-    elif income <= 900000:
-        tax = (300000 * 0.05) + (income - 600000) * 0.10
-    elif income <= 1200000:
-        tax = (300000 * 0.05) + (300000 * 0.10) + (income - 900000) * 0.15
-    elif income <= 1500000:
-        tax = (300000 * 0.05) + (300000 * 0.10) + (300000 * 0.15) + (income - 1200000) * 0.20
-    else:
-        tax = (300000 * 0.05) + (300000 * 0.10) + (300000 * 0.15) + (300000 * 0.20) + (income - 1500000) * 0.30
-    return tax
+    return get_regime("new").tax(income)
+
+# Batch version of calculate_old_regime_tax
+def calculate_old_regime_tax_batch(incomes):
+    """
+    Calculates Old Regime tax for a sequence or NumPy array of incomes.
+    Gives the same results as calling calculate_old_regime_tax on each one.
+    """
+    return get_regime("old").tax_batch(incomes)
 
-def main():
+# Batch version of calculate_new_regime_tax
+def calculate_new_regime_tax_batch(incomes):
+    """
+    Calculates New Regime tax for a sequence or NumPy array of incomes.
+    Gives the same results as calling calculate_new_regime_tax on each one.
+    """
+    return get_regime("new").tax_batch(incomes)
+
+def calculate_tax_batch(incomes):
+    """
+    Calculates tax under both regimes for many incomes.
+    Returns a tuple of (old regime taxes, new regime taxes).
+    """
+    taxes = compare_regimes(incomes, [get_regime("old"), get_regime("new")])
+    return taxes[("old", DEFAULT_FISCAL_YEAR)], taxes[("new", DEFAULT_FISCAL_YEAR)]
+
+# Columns written for every employee by the batch payroll mode
+PAYROLL_OUTPUT_FIELDS = ["id", "total_income", "old_regime_tax", "new_regime_tax", "savings", "better_regime"]
+
+def read_employee_chunks(path, chunk_size):
+    """
+    Streams employee rows (id, ctc, bonus) from a CSV or JSONL file in lists
+    of at most 'chunk_size' dicts, so memory stays bounded for any file size.
+    """
+    with open(path, 'r', newline='') as f:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+def process_payroll_chunk(rows, fiscal_year=DEFAULT_FISCAL_YEAR):
+    """
+    Calculates old/new regime tax and savings for a chunk of employee rows.
+    Rows with a missing or non-numeric CTC/bonus are skipped.
+    Returns (result rows, ids of skipped rows).
+    """
+    ids, incomes, skipped = [], [], []
+    for row in rows:
+        try:
+            income = float(row["ctc"]) + float(row.get("bonus") or 0)
+        except (KeyError, TypeError, ValueError):
+            skipped.append(row.get("id"))
+            continue
+        ids.append(row.get("id"))
+        incomes.append(income)
+
+    taxes = compare_regimes(incomes, [get_regime("old", fiscal_year), get_regime("new", fiscal_year)])
+    old_taxes, new_taxes = taxes[("old", fiscal_year)], taxes[("new", fiscal_year)]
+    results = []
+    for employee_id, income, old_tax, new_tax in zip(ids, incomes, old_taxes, new_taxes):
+        old_tax, new_tax = round(float(old_tax), 2), round(float(new_tax), 2)
+        if old_tax < new_tax:
+            better = "old"
+        elif new_tax < old_tax:
+            better = "new"
+        else:
+            better = "same"
+        results.append([employee_id, income, old_tax, new_tax, round(abs(old_tax - new_tax), 2), better])
+    return results, skipped
+
+def run_batch(input_path, output_path, chunk_size=100000, workers=1, fiscal_year=DEFAULT_FISCAL_YEAR):
+    """
+    Runs the payroll calculation over a whole CSV/JSONL file of employees and
+    writes one result row per employee to a CSV or JSONL output file.
+    With workers > 1 chunks are processed on a process pool; at most two
+    chunks per worker are in flight, so memory stays bounded.
+    Returns (rows written, rows skipped).
+    """
+    get_regime("old", fiscal_year)  # Fail early on an unknown fiscal year
+    written = skipped = 0
+    chunks = read_employee_chunks(input_path, chunk_size)
+    with open(output_path, 'w', newline='') as out:
+        as_csv = output_path.lower().endswith(".csv")
+        writer = csv.writer(out) if as_csv else None
+        if as_csv:
+            writer.writerow(PAYROLL_OUTPUT_FIELDS)
+
+        def write(result):
+            nonlocal written, skipped
+            rows, skipped_ids = result
+            if as_csv:
+                writer.writerows(rows)
+            else:
+                out.writelines(json.dumps(dict(zip(PAYROLL_OUTPUT_FIELDS, row))) + "\n" for row in rows)
+            written += len(rows)
+            skipped += len(skipped_ids)
+            for employee_id in skipped_ids[:5]:
+                print(f" SKIPPED ROW WITH INVALID CTC/BONUS (ID: {employee_id})")
+
+        if workers <= 1:
+            for chunk in chunks:
+                write(process_payroll_chunk(chunk, fiscal_year))
+            return written, skipped
+
+        with Pool(workers) as pool:
+            pending = []
+            for chunk in chunks:
+                pending.append(pool.apply_async(process_payroll_chunk, (chunk, fiscal_year)))
+                if len(pending) >= 2 * workers:
+                    write(pending.pop(0).get())
+            for result in pending:
+                write(result.get())
+    return written, skipped
+
+# Hot paths wrapped when instrumentation is on: (class, or None for this
+# module's functions; category; names or (name, byte counter) pairs). A
+# byte counter gets the call's result and arguments and returns the
+# (read, written) bytes. Chunks processed by pool workers are timed only
+# as part of run_batch.
+INSTRUMENTED_CALLS = [
+    (TaxRegime, "tax", ["tax", "tax_batch"]),
+    (None, "tax", ["calculate_old_regime_tax", "calculate_new_regime_tax", "calculate_old_regime_tax_batch",
+                   "calculate_new_regime_tax_batch", "calculate_tax_batch", "compare_regimes",
+                   "process_payroll_chunk",
+                   ("run_batch", lambda result, a: (os.path.getsize(a["input_path"]),
+                                                    os.path.getsize(a["output_path"])))]),
+]
+
+def parse_args(argv=None):
+    """
+    Parses the command line. Without --batch the interactive calculator runs.
+    """
+    parser = argparse.ArgumentParser(description="Console-based tax calculator")
+    parser.add_argument("--batch", metavar="INPUT",
+                        help="CSV/JSONL file of employees with id, ctc and bonus columns")
+    parser.add_argument("--output", default="payroll_tax.csv",
+                        help="Result file for --batch, CSV or JSONL (default: payroll_tax.csv)")
+    parser.add_argument("--chunk-size", type=int, default=100000,
+                        help="Employees processed per chunk (default: 100000)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for --batch (default: 1)")
+    parser.add_argument("--fiscal-year", default=DEFAULT_FISCAL_YEAR,
+                        help=f"Fiscal year of the regimes to use (default: {DEFAULT_FISCAL_YEAR})")
+    if instrumentation is not None:
+        instrumentation.add_arguments(parser, "the tax calculations")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main function to run the console-based tax calculator.
     Takes CTC and Bonus as input, calculates tax under both regimes,
-    and displays the results.
+    and displays the results. With --batch it processes a whole file.
+    Returns the process exit code.
     """
+    args = parse_args(argv)
+    if instrumentation is not None:
+        instrumentation.install_from_args(args, __name__, "tax", INSTRUMENTED_CALLS)
+    if args.batch:
+        start = time.perf_counter()
+        try:
+            written, skipped = run_batch(args.batch, args.output, args.chunk_size, args.workers, args.fiscal_year)
+        except (OSError, ValueError) as e:
+            print(f"Batch run failed: {e}")
+            return 1
+        elapsed = time.perf_counter() - start
+        rate = written / elapsed if elapsed > 0 else float("inf")
+        print(f" PROCESSED {written} EMPLOYEES ({skipped} SKIPPED) IN {elapsed:.2f}s ({rate:.0f} ROWS/S)")
+        print(f" RESULTS WRITTEN TO {args.output}")
+        return 0
+
     print("TAX CALCULATOR")
 
     try:
@@ -78,4 +503,4 @@ def main():
         print("\n Tax deduction is the same for both regimes.")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
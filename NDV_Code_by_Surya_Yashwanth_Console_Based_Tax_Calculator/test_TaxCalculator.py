@@ -0,0 +1,102 @@
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "TaxCalculator.py")
+spec = importlib.util.spec_from_file_location("tax_calculator", SCRIPT)
+tax = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tax)
+
+
+def baseline_old_regime_tax(income):
+    # The slab ladder the calculator used before the regimes file
+    taxable_income = max(0, income - 50000)
+    if taxable_income <= 250000:
+        return 0
+    if taxable_income <= 500000:
+        return (taxable_income - 250000) * 0.05
+    if taxable_income <= 1000000:
+        return (250000 * 0.05) + (taxable_income - 500000) * 0.20
+    return (250000 * 0.05) + (500000 * 0.20) + (taxable_income - 1000000) * 0.30
+
+
+def baseline_new_regime_tax(income):
+    if income <= 300000:
+        return 0
+    if income <= 600000:
+        return (income - 300000) * 0.05
+    if income <= 900000:
+        return (300000 * 0.05) + (income - 600000) * 0.10
+    if income <= 1200000:
+        return (300000 * 0.05) + (300000 * 0.10) + (income - 900000) * 0.15
+    if income <= 1500000:
+        return (300000 * 0.05) + (300000 * 0.10) + (300000 * 0.15) + (income - 1200000) * 0.20
+    return (300000 * 0.05) + (300000 * 0.10) + (300000 * 0.15) + (300000 * 0.20) + (income - 1500000) * 0.30
+
+
+def edge_incomes(*regimes, deductions=None):
+    # Every breakpoint of the regimes, a rupee either side of it, and a spread in between
+    points = {0.0, 1.0, 123456.0, 987654.32, 3e6, 7.5e7}
+    for regime in regimes:
+        for point in regime.breakpoints(deductions):
+            points.update((point - 1, point, point + 1))
+    return sorted(point for point in points if point >= 0)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_simplified_regimes_match_the_baseline_ladder(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(tax, "np", None)
+    old, new = tax.get_regime("old"), tax.get_regime("new")
+    incomes = edge_incomes(old, new)
+    for regime, baseline in ((old, baseline_old_regime_tax), (new, baseline_new_regime_tax)):
+        expected = [baseline(income) for income in incomes]
+        assert [regime.tax(income) for income in incomes] == pytest.approx(expected, abs=1e-6)
+        assert list(regime.tax_batch(incomes)) == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("deductions", [0, 100000, 175000, 500000])
+def test_tax_batch_matches_tax_with_rebate_surcharge_and_cess(monkeypatch, use_numpy, deductions):
+    if not use_numpy:
+        monkeypatch.setattr(tax, "np", None)
+    for name in ("old", "new"):
+        regime = tax.get_regime(name, "2024-25")
+        assert regime.rebate and regime.surcharge and regime.cess_rate
+        incomes = edge_incomes(regime, deductions=deductions)
+        expected = [regime.tax(income, deductions) for income in incomes]
+        assert list(regime.tax_batch(incomes, deductions)) == pytest.approx(expected, rel=1e-12, abs=1e-6)
+        claimed = [deductions] * len(incomes)
+        assert list(regime.tax_batch(incomes, claimed)) == pytest.approx(expected, rel=1e-12, abs=1e-6)
+
+
+def test_batch_exit_status(tmp_path):
+    employees = tmp_path / "employees.csv"
+    employees.write_text("id,ctc,bonus\n1,900000,50000\n2,oops,0\n")
+    output = str(tmp_path / "taxes.csv")
+    assert tax.main(["--batch", str(employees), "--output", output]) == 0
+    assert tax.main(["--batch", str(tmp_path / "missing.csv"), "--output", output]) == 1
+    assert tax.main(["--batch", str(employees), "--output", output, "--fiscal-year", "1999"]) == 1
+
+
+@pytest.mark.parametrize("fiscal_year, deductions", [
+    ("simplified", None), ("2024-25", None), ("2024-25", 150000), ("2024-25", 400000),
+])
+def test_break_even_incomes_match_a_brute_force_scan(fiscal_year, deductions):
+    old, new = tax.get_regime("old", fiscal_year), tax.get_regime("new", fiscal_year)
+    last = max(old.breakpoints(deductions) + new.breakpoints(deductions))
+    step = 250
+    incomes = np.arange(0, 1.5 * last + 1e6, step)
+    difference = old.tax_batch(incomes, deductions or 0) - new.tax_batch(incomes, deductions or 0)
+    signs = np.where(np.abs(difference) <= 1e-6, 0, np.sign(difference))
+    changes = np.flatnonzero(np.diff(signs)) + 1
+    cheaper = {1: new, -1: old, 0: None}
+
+    transitions = tax.break_even_incomes(old, new, deductions)
+    assert len(transitions) == len(changes)
+    for (income, regime), index in zip(transitions, changes):
+        # The cheaper regime changes just above 'income', so between the two scanned incomes
+        assert incomes[index - 1] - 1e-6 <= income < incomes[index]
+        assert regime is cheaper[signs[index]]